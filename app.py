@@ -1,8 +1,18 @@
-from flask import Flask, jsonify, request
+from src.startup_profile import startup_profile
 import logging
 import os
 from datetime import datetime
-from src.bot import CryptoBot
+
+with startup_profile.measure('flask', 'import'):
+    from flask import Flask, jsonify, request, Response
+
+with startup_profile.measure('app', 'import'):
+    from src.bot import CryptoBot
+    from src.scheduler import BotScheduler
+    from src.health_monitor import HealthMonitor
+    from src.post_outbox import OutboxWorker
+    from src.metrics import registry
+    from config import SCHEDULER_ENABLED, STORAGE_BACKEND
 
 # Configure logging
 logging.basicConfig(
@@ -14,46 +24,65 @@ logging.basicConfig(
 app = Flask(__name__)
 logger = logging.getLogger(__name__)
 
-# Initialize bot
+# Initialize bot (components and SDKs load lazily on first use)
 bot = CryptoBot()
 
+# Cycles run on a background worker; /run only enqueues
+scheduler = BotScheduler(bot)
+scheduler.start(periodic=SCHEDULER_ENABLED)
+
+# Health probes read a snapshot refreshed in the background
+health_monitor = HealthMonitor(bot)
+health_monitor.start()
+
+# Tweets that failed to post are retried from the durable outbox
+outbox_worker = OutboxWorker(bot)
+outbox_worker.start()
+
+startup_profile.mark_ready()
+
 @app.route('/')
 def home():
     """Home endpoint with bot status"""
     return jsonify({
         "status": "active",
         "service": "crypto-news-bot",
-        "database": "supabase",
+        "database": STORAGE_BACKEND,
         "timestamp": datetime.now().isoformat(),
         "endpoints": {
             "health": "/health",
             "run": "/run", 
+            "jobs": "/jobs/<job_id>",
             "stats": "/stats",
+            "metrics": "/metrics",
+            "startup": "/startup",
             "database": "/database/health"
         }
     })
 
 @app.route('/health')
 def health_check():
-    """Health check endpoint"""
+    """Health check endpoint (add ?fresh=1 to force a bounded-time refresh)"""
     try:
-        # Check Twitter API connection
-        twitter_healthy = bot.twitter.verify_credentials()
+        snapshot = health_monitor.get_snapshot(fresh=request.args.get('fresh') == '1')
+        twitter = snapshot['twitter']
+        database = snapshot['database']
+        stats = snapshot['stats']['value'] or {}
         
-        # Check Supabase connection
-        db_health = bot.db.health_check()
-        
-        # Get basic stats
-        stats = bot.db.get_bot_stats()
+        if twitter['ok'] is None:
+            twitter_status = "unknown"
+        else:
+            twitter_status = "connected" if twitter['ok'] else "disconnected"
         
         return jsonify({
             "status": "healthy",
-            "twitter_api": "connected" if twitter_healthy else "disconnected",
-            "database": db_health,
+            "twitter_api": twitter_status,
+            "database": database['value'] or {"status": "unknown", "error": database['error']},
             "statistics": {
                 "total_posts": stats.get('total_posts', 0),
                 "today_posts": stats.get('today_posts', 0)
             },
+            "checked_at": {name: check['checked_at'] for name, check in snapshot.items()},
             "timestamp": datetime.now().isoformat()
         })
     except Exception as e:
@@ -66,45 +95,45 @@ def health_check():
 def database_health():
     """Database-specific health check"""
     try:
-        health = bot.db.health_check()
+        database = health_monitor.get_snapshot(fresh=request.args.get('fresh') == '1')['database']
+        health = dict(database['value'] or {"status": "unknown", "error": database['error']})
+        health['checked_at'] = database['checked_at']
         return jsonify(health)
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 @app.route('/run', methods=['POST', 'GET'])
 def run_bot():
-    """Run the bot for one cycle"""
+    """Queue one bot cycle and return its job ID immediately"""
     try:
-        logger.info("🚀 Starting bot cycle via API request...")
-        
-        success = bot.run_single_cycle()
+        job = scheduler.submit(trigger='api')
+        logger.info(f"🚀 Bot cycle queued via API request: {job['id']}")
         
-        if success:
-            logger.info("✅ Bot cycle completed successfully")
-            return jsonify({
-                "status": "success",
-                "message": "Tweet posted successfully",
-                "database": "supabase",
-                "timestamp": datetime.now().isoformat()
-            })
-        else:
-            logger.info("⏭️ Bot cycle skipped (no tweet posted)")
-            return jsonify({
-                "status": "skipped", 
-                "message": "No tweet posted this cycle",
-                "database": "supabase",
-                "timestamp": datetime.now().isoformat()
-            })
+        return jsonify({
+            "status": job['status'],
+            "job_id": job['id'],
+            "status_url": f"/jobs/{job['id']}",
+            "database": STORAGE_BACKEND,
+            "timestamp": datetime.now().isoformat()
+        }), 202
             
     except Exception as e:
-        logger.error(f"❌ Bot cycle failed: {e}")
+        logger.error(f"❌ Failed to queue bot cycle: {e}")
         return jsonify({
             "status": "error",
             "message": str(e),
-            "database": "supabase",
+            "database": STORAGE_BACKEND,
             "timestamp": datetime.now().isoformat()
         }), 500
 
+@app.route('/jobs/<job_id>')
+def get_job(job_id):
+    """Get the status of a queued or finished bot cycle"""
+    job = scheduler.get_job(job_id)
+    if not job:
+        return jsonify({"error": f"Unknown job: {job_id}"}), 404
+    return jsonify(job)
+
 @app.route('/stats')
 def get_stats():
     """Get bot statistics"""
@@ -113,17 +142,34 @@ def get_stats():
         recent_posts = bot.db.get_recent_posts(5)
         
         return jsonify({
-            "database": "supabase",
+            "database": STORAGE_BACKEND,
             "statistics": stats,
             "recent_posts": recent_posts,
+            "tweet_cache": bot.content_gen.tweet_cache.get_stats(),
+            "twitter_accounts": bot.twitter.get_stats(),
+            "outbox": bot.outbox.get_stats(),
+            "news_sources": bot.api_client.source_health.get_stats(),
+            "hedging": bot.api_client.get_hedge_stats(),
+            "transport": bot.api_client.get_transport_stats(),
+            "post_journal": bot.db.journal.get_stats() if bot.db.journal else None,
             "timestamp": datetime.now().isoformat()
         })
     except Exception as e:
         return jsonify({
             "error": str(e),
-            "database": "supabase"
+            "database": STORAGE_BACKEND
         }), 500
 
+@app.route('/metrics')
+def metrics():
+    """Prometheus metrics for cycle stages and external calls"""
+    return Response(registry.render(), mimetype='text/plain; version=0.0.4')
+
+@app.route('/startup')
+def startup_report():
+    """Import and init cost per component, including lazily built ones"""
+    return jsonify(startup_profile.report())
+
 @app.route('/cleanup', methods=['POST'])
 def cleanup_old_data():
     """Cleanup old records (admin function)"""
@@ -134,7 +180,7 @@ def cleanup_old_data():
         return jsonify({
             "status": "success",
             "message": f"Cleaned up {deleted_count} records older than {days} days",
-            "database": "supabase"
+            "database": STORAGE_BACKEND
         })
     except Exception as e:
         return jsonify({"error": str(e)}), 500
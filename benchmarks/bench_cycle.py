@@ -0,0 +1,197 @@
+import argparse
+import json
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+# Keep indexes, caches and journals out of the real data directory
+os.environ.setdefault('BOT_DATA_DIR', tempfile.mkdtemp(prefix='bot-bench-'))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fakes import (
+    FaultProfile, FakeNewsServer, FakeGeminiModel, FakeTwitterClient, FakeSupabaseClient
+)
+from src.api_clients import APIClient
+from src.bot import CryptoBot
+from src.content_generator import ContentGenerator
+from src.database import DatabaseManager
+from src.metrics import CYCLE_TOTAL
+from src.news_manager import NewsManager
+from src.twitter_manager import TwitterManager
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(int(round(pct / 100 * (len(ordered) - 1))), len(ordered) - 1)
+    return ordered[index]
+
+class StageRecorder:
+    """Wraps bot methods to record per-stage latency and allocated bytes"""
+
+    def __init__(self, trace_allocations):
+        self.trace_allocations = trace_allocations
+        self.stages = {}
+
+    def wrap(self, obj, attr, stage):
+        original = getattr(obj, attr)
+        samples = self.stages.setdefault(stage, {'seconds': [], 'alloc_bytes': []})
+
+        def wrapper(*args, **kwargs):
+            if self.trace_allocations:
+                tracemalloc.reset_peak()
+                before = tracemalloc.get_traced_memory()[0]
+            started = time.perf_counter()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                samples['seconds'].append(time.perf_counter() - started)
+                if self.trace_allocations:
+                    samples['alloc_bytes'].append(tracemalloc.get_traced_memory()[1] - before)
+
+        setattr(obj, attr, wrapper)
+
+    def reset(self):
+        for samples in self.stages.values():
+            samples['seconds'].clear()
+            samples['alloc_bytes'].clear()
+
+    def summary(self):
+        report = {}
+        for stage, samples in self.stages.items():
+            seconds = samples['seconds']
+            allocs = samples['alloc_bytes']
+            report[stage] = {
+                'calls': len(seconds),
+                'p50_ms': round(percentile(seconds, 50) * 1000, 2),
+                'p99_ms': round(percentile(seconds, 99) * 1000, 2),
+                'mean_alloc_kib': round(sum(allocs) / len(allocs) / 1024, 1) if allocs else None
+            }
+        return report
+
+def build_bot(args, rng):
+    news_server = FakeNewsServer(
+        FaultProfile(args.feed_latency, args.feed_error_rate, random.Random(rng.random()),
+                     tail_rate=args.feed_tail_rate, tail_factor=args.feed_tail_factor),
+        feed_size=args.feed_size,
+        seed=args.seed
+    ).start()
+
+    api_client = APIClient()
+    for source, config in api_client.api_configs.items():
+        config['url'] = f'{news_server.base_url}/{source}'
+    if not args.feed_cache:
+        api_client.feed_cache.ttl = 0
+        api_client.feed_cache.stale_grace = 0
+
+    bot = CryptoBot(
+        db=DatabaseManager(client=FakeSupabaseClient(
+            FaultProfile(args.db_latency, args.db_error_rate, random.Random(rng.random())))),
+        api_client=api_client,
+        content_gen=ContentGenerator(model=FakeGeminiModel(
+            FaultProfile(args.llm_latency, args.llm_error_rate, random.Random(rng.random())))),
+        twitter=TwitterManager(
+            accounts={
+                f'bench{index + 1}': FakeTwitterClient(
+                    FaultProfile(args.tweet_latency, args.tweet_error_rate, random.Random(rng.random())))
+                for index in range(args.twitter_accounts)
+            },
+            post_limit=10 ** 9  # measure posting, not the X API budget
+        ),
+        news_manager=NewsManager()
+    )
+    # Measure the pipeline itself, not the failure cooldown
+    bot.max_consecutive_failures = float('inf')
+    return bot, news_server
+
+def run(args):
+    rng = random.Random(args.seed)
+    random.seed(args.seed)
+    bot, news_server = build_bot(args, rng)
+
+    recorder = StageRecorder(trace_allocations=not args.no_alloc)
+    recorder.wrap(bot, 'get_news_with_fallback', 'fetch')
+    recorder.wrap(bot, 'select_candidates', 'filter_dedup')
+    recorder.wrap(bot.content_gen, 'create_high_quality_tweet', 'generate')
+    recorder.wrap(bot.twitter, 'post_to_accounts', 'post')
+
+    try:
+        for _ in range(args.warmup):
+            bot.run_single_cycle()
+        recorder.reset()
+        outcomes_before = dict(CYCLE_TOTAL.values)
+
+        if not args.no_alloc:
+            tracemalloc.start()
+        cycle_seconds = []
+        started = time.perf_counter()
+        for _ in range(args.cycles):
+            cycle_started = time.perf_counter()
+            bot.run_single_cycle()
+            cycle_seconds.append(time.perf_counter() - cycle_started)
+        elapsed = time.perf_counter() - started
+        if not args.no_alloc:
+            tracemalloc.stop()
+    finally:
+        news_server.stop()
+
+    outcomes = {
+        dict(labels).get('outcome', ''): count - outcomes_before.get(labels, 0)
+        for labels, count in CYCLE_TOTAL.values.items()
+        if count - outcomes_before.get(labels, 0)
+    }
+    return {
+        'cycles': args.cycles,
+        'elapsed_seconds': round(elapsed, 3),
+        'cycles_per_second': round(args.cycles / elapsed, 2) if elapsed else None,
+        'cycle_p50_ms': round(percentile(cycle_seconds, 50) * 1000, 2),
+        'cycle_p99_ms': round(percentile(cycle_seconds, 99) * 1000, 2),
+        'outcomes': outcomes,
+        'stages': recorder.summary()
+    }
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark CryptoBot cycles against local fakes')
+    parser.add_argument('--cycles', type=int, default=200)
+    parser.add_argument('--warmup', type=int, default=10)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--feed-size', type=int, default=20, help='articles per fake feed response')
+    parser.add_argument('--feed-latency', type=float, default=0.02)
+    parser.add_argument('--feed-error-rate', type=float, default=0.0)
+    parser.add_argument('--feed-tail-rate', type=float, default=0.0, help='share of feed requests that hit the slow tail')
+    parser.add_argument('--feed-tail-factor', type=float, default=10.0, help='latency multiplier for tail requests')
+    parser.add_argument('--feed-cache', action='store_true', help='keep the feed cache enabled')
+    parser.add_argument('--llm-latency', type=float, default=0.05)
+    parser.add_argument('--llm-error-rate', type=float, default=0.0)
+    parser.add_argument('--tweet-latency', type=float, default=0.02)
+    parser.add_argument('--tweet-error-rate', type=float, default=0.0)
+    parser.add_argument('--twitter-accounts', type=int, default=1, help='accounts each tweet is posted to')
+    parser.add_argument('--db-latency', type=float, default=0.01)
+    parser.add_argument('--db-error-rate', type=float, default=0.0)
+    parser.add_argument('--no-alloc', action='store_true', help='skip tracemalloc allocation tracking')
+    parser.add_argument('--json', action='store_true', help='print the report as JSON')
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.CRITICAL)  # fault injection makes the bot log loudly
+    report = run(args)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print(f"cycles: {report['cycles']} in {report['elapsed_seconds']}s ({report['cycles_per_second']} cycles/s)")
+    print(f"cycle latency: p50 {report['cycle_p50_ms']} ms, p99 {report['cycle_p99_ms']} ms")
+    print(f"outcomes: {report['outcomes']}")
+    print(f"{'stage':<14}{'calls':>7}{'p50 ms':>10}{'p99 ms':>10}{'alloc KiB':>11}")
+    for stage, stats in report['stages'].items():
+        alloc = stats['mean_alloc_kib'] if stats['mean_alloc_kib'] is not None else '-'
+        print(f"{stage:<14}{stats['calls']:>7}{stats['p50_ms']:>10}{stats['p99_ms']:>10}{alloc:>11}")
+
+if __name__ == '__main__':
+    main()
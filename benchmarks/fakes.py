@@ -0,0 +1,272 @@
+import itertools
+import json
+import random
+import re
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+
+import tweepy
+
+VOCABULARY = (
+    'bitcoin ethereum defi nft web3 blockchain trading market price regulation sec binance coinbase '
+    'altcoin bullish bearish solana layer rollup staking validator exchange custody etf inflows '
+    'outflows whale wallet token stablecoin liquidity yield bridge mainnet upgrade fork miner hashrate '
+    'treasury fund institutional retail volatility rally correction breakout support resistance'
+).split()
+
+class FaultProfile:
+    """Latency (seconds), error rate and latency tail for one fake service"""
+
+    def __init__(self, latency=0.0, error_rate=0.0, rng=None, tail_rate=0.0, tail_factor=10.0):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.tail_rate = tail_rate
+        self.tail_factor = tail_factor
+        self.rng = rng or random.Random()
+        self._lock = threading.Lock()
+
+    def apply(self):
+        """Sleep for a jittered latency; return True when this call should fail"""
+        with self._lock:
+            delay = self.latency * self.rng.uniform(0.5, 1.5) if self.latency else 0.0
+            if self.tail_rate and self.rng.random() < self.tail_rate:
+                delay *= self.tail_factor
+            failed = self.rng.random() < self.error_rate
+        if delay:
+            time.sleep(delay)
+        return failed
+
+class FakeNewsServer:
+    """HTTP server that mimics the three RapidAPI news feeds, producing fresh articles every request"""
+
+    SOURCES = ('coingecko', 'coinranking', 'coinpaprika')
+
+    def __init__(self, profile, feed_size=20, seed=0):
+        self.profile = profile
+        self.feed_size = feed_size
+        self.rng = random.Random(seed)
+        self.counter = itertools.count()
+        self._lock = threading.Lock()
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), self._handler())
+        self.thread = threading.Thread(target=self.server.serve_forever, name='fake-news', daemon=True)
+
+    @property
+    def base_url(self):
+        host, port = self.server.server_address
+        return f'http://{host}:{port}'
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def article(self):
+        with self._lock:
+            n = next(self.counter)
+            words = [self.rng.choice(VOCABULARY) for _ in range(8)]
+            details = [self.rng.choice(VOCABULARY) for _ in range(25)]
+        title = f"{' '.join(words).capitalize()} update {n}"
+        description = f"Report {n}: " + ' '.join(details) + '.'
+        return {
+            'title': title,
+            'description': description,
+            'url': f'https://news.example/{n}',
+            'author': 'Bench Writer',
+            'created_at': datetime.now().isoformat(),
+            'published_at': datetime.now().isoformat(),
+            'date': datetime.now().isoformat()
+        }
+
+    def feed(self, source):
+        articles = [self.article() for _ in range(self.feed_size)]
+        if source == 'coinpaprika':
+            return articles
+        return {'data': {'news': articles}}
+
+    def _handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                source = self.path.strip('/').split('/')[0]
+                if fake.profile.apply() or source not in fake.SOURCES:
+                    self.send_response(500)
+                    self.end_headers()
+                    return
+                body = json.dumps(fake.feed(source)).encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+class FakeGeminiModel:
+    """Stands in for genai.GenerativeModel and writes a valid tweet from the prompt"""
+
+    TITLE = re.compile(r'Title: (.*)')
+
+    def __init__(self, profile):
+        self.profile = profile
+
+    def generate_content(self, prompt, generation_config=None, safety_settings=None, stream=False):
+        # Same keywords as the pinned SDK, which rejects anything else when building the request
+        if self.profile.apply():
+            raise RuntimeError('fake Gemini error')
+        if 'JSON array' in prompt:
+            tweets = [{'id': index, 'tweet': self.tweet(title)}
+                      for index, title in enumerate(self.TITLE.findall(prompt), 1)]
+            return SimpleNamespace(text=json.dumps(tweets))
+        match = self.TITLE.search(prompt)
+        return SimpleNamespace(text=self.tweet(match.group(1) if match else 'Crypto markets move'))
+
+    def tweet(self, title):
+        return f"BREAKING: {title.strip()[:150]} could shift sentiment across the market. What is your take? #Crypto #Bitcoin"
+
+class FakeTwitterClient:
+    """Stands in for tweepy.Client"""
+
+    def __init__(self, profile):
+        self.profile = profile
+        self.ids = itertools.count(1)
+        self.posted = []
+
+    def create_tweet(self, text=None, **kwargs):
+        if self.profile.apply():
+            raise tweepy.TweepyException('fake Twitter error')
+        tweet_id = str(next(self.ids))
+        self.posted.append(text)
+        return SimpleNamespace(data={'id': tweet_id, 'text': text})
+
+    def get_me(self, **kwargs):
+        if self.profile.apply():
+            raise tweepy.TweepyException('fake Twitter error')
+        return SimpleNamespace(data={'id': '0', 'username': 'bench'})
+
+class FakeSupabaseClient:
+    """In-memory stand-in for the slice of the supabase client DatabaseManager uses"""
+
+    def __init__(self, profile):
+        self.profile = profile
+        self.tables = {}
+        self.ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def table(self, name):
+        return _FakeQuery(self, self.tables.setdefault(name, []))
+
+class _FakeQuery:
+    def __init__(self, client, rows):
+        self.client = client
+        self.rows = rows
+        self.filters = []
+        self.action = 'select'
+        self.columns = None
+        self.count = None
+        self.payload = None
+        self.order_by = None
+        self.window = None
+
+    def select(self, *columns, count=None):
+        self.columns = [c.strip() for column in columns for c in column.split(',')]
+        self.count = count
+        return self
+
+    def insert(self, data):
+        self.action = 'insert'
+        self.payload = data if isinstance(data, list) else [data]
+        return self
+
+    def delete(self):
+        self.action = 'delete'
+        return self
+
+    def eq(self, column, value):
+        self.filters.append(lambda row: row.get(column) == value)
+        return self
+
+    def gt(self, column, value):
+        self.filters.append(lambda row: row.get(column) is not None and row.get(column) > value)
+        return self
+
+    def gte(self, column, value):
+        self.filters.append(lambda row: row.get(column) is not None and row.get(column) >= value)
+        return self
+
+    def lt(self, column, value):
+        self.filters.append(lambda row: row.get(column) is not None and row.get(column) < value)
+        return self
+
+    def in_(self, column, values):
+        values = set(values)
+        self.filters.append(lambda row: row.get(column) in values)
+        return self
+
+    def or_(self, filters):
+        clauses = _parse_or_filters(filters)
+        self.filters.append(lambda row: any(row.get(column) in values for column, values in clauses))
+        return self
+
+    def order(self, column, desc=False):
+        self.order_by = (column, desc)
+        return self
+
+    def limit(self, size):
+        self.window = (0, size)
+        return self
+
+    def range(self, start, end):
+        self.window = (start, end - start + 1)
+        return self
+
+    def execute(self):
+        if self.client.profile.apply():
+            raise RuntimeError('fake Supabase error')
+
+        with self.client._lock:
+            if self.action == 'insert':
+                inserted = []
+                for row in self.payload:
+                    row = dict(row, id=next(self.client.ids))
+                    self.rows.append(row)
+                    inserted.append(row)
+                return SimpleNamespace(data=inserted, count=None)
+
+            matched = [row for row in self.rows if all(f(row) for f in self.filters)]
+            if self.action == 'delete':
+                for row in matched:
+                    self.rows.remove(row)
+                return SimpleNamespace(data=matched, count=None)
+
+            if self.order_by:
+                column, desc = self.order_by
+                matched.sort(key=lambda row: row.get(column) or '', reverse=desc)
+            total = len(matched)
+            if self.window:
+                start, size = self.window
+                matched = matched[start:start + size]
+            if self.columns and '*' not in self.columns:
+                matched = [{c: row.get(c) for c in self.columns} for row in matched]
+            return SimpleNamespace(data=[dict(row) for row in matched], count=total if self.count else None)
+
+def _parse_or_filters(filters):
+    """Parse the column.in.("a","b") clauses DatabaseManager builds for or_()"""
+    clauses = []
+    for match in re.finditer(r'(\w+)\.in\.\(((?:"(?:[^"\\]|\\.)*",?)*)\)', filters):
+        column, body = match.groups()
+        values = {
+            re.sub(r'\\(.)', r'\1', value)
+            for value in re.findall(r'"((?:[^"\\]|\\.)*)"', body)
+        }
+        clauses.append((column, values))
+    return clauses
@@ -1,3 +1,5 @@
+import json
+import logging
 import os
 from dotenv import load_dotenv
 
@@ -10,23 +12,104 @@ TWITTER_API_KEY = os.getenv('TWITTER_API_KEY')
 TWITTER_API_SECRET = os.getenv('TWITTER_API_SECRET')
 TWITTER_ACCESS_TOKEN = os.getenv('TWITTER_ACCESS_TOKEN')
 TWITTER_ACCESS_SECRET = os.getenv('TWITTER_ACCESS_SECRET')
+# Extra accounts as a JSON list of {"name", "api_key", "api_secret", "access_token", "access_secret"}
+try:
+    TWITTER_ACCOUNTS = json.loads(os.getenv('TWITTER_ACCOUNTS') or '[]')
+    if not isinstance(TWITTER_ACCOUNTS, list):
+        raise ValueError('expected a JSON list')
+except ValueError as e:
+    # json.JSONDecodeError is a ValueError; a bad value must not take the whole app down
+    logging.getLogger(__name__).error(f"❌ Ignoring TWITTER_ACCOUNTS, posting from the primary account only: {e}")
+    TWITTER_ACCOUNTS = []
 
-# Supabase Configuration
+# Storage Configuration
+STORAGE_BACKEND = os.getenv('STORAGE_BACKEND', 'sqlite')  # 'sqlite' (local primary) or 'supabase'
 SUPABASE_URL = os.getenv('SUPABASE_URL')
 SUPABASE_KEY = os.getenv('SUPABASE_KEY')
+SUPABASE_REPLICA = os.getenv('SUPABASE_REPLICA', 'true').lower() == 'true'  # mirror local posts to Supabase
+
+# Local Storage
+DATA_DIR = os.getenv('BOT_DATA_DIR', '.botdata')
+SQLITE_PATH = os.path.join(DATA_DIR, 'bot.sqlite3')
+SQLITE_BACKFILL_RETRY_MAX = 300  # longest wait in seconds between failed backfill attempts
+DEDUP_INDEX_PATH = os.path.join(DATA_DIR, 'dedup_index.bin')
+DEDUP_INDEX_CAPACITY = 100000
+DEDUP_INDEX_ERROR_RATE = 0.001
+SIMILARITY_INDEX_PATH = os.path.join(DATA_DIR, 'similarity_index.v2.jsonl')
+SIMILARITY_THRESHOLD = 0.4  # estimated Jaccard similarity that counts as the same story
+SIMILARITY_WINDOW_DAYS = 3
+SIMILARITY_MAX_ENTRIES = 50000
+TWEET_CACHE_PATH = os.path.join(DATA_DIR, 'tweet_cache.json')
+TWEET_CACHE_SIZE = 256
+TWEET_CACHE_TTL = 6 * 3600  # seconds a generated tweet stays reusable
+OUTBOX_PATH = os.path.join(DATA_DIR, 'outbox.sqlite3')
+OUTBOX_MAX_ATTEMPTS = 8  # failed posting attempts before a tweet is given up on
+OUTBOX_RETRY_BASE = 30  # seconds before the first retry, doubled on each failure
+OUTBOX_RETRY_MAX = 3600  # cap on the retry backoff
+OUTBOX_POLL_INTERVAL = 60  # max seconds the drain worker sleeps between passes
+OUTBOX_STARTUP_DELAY = 10  # seconds after boot before the first drain pass
+OUTBOX_FAILED_RETENTION = 7 * 24 * 3600  # seconds a given-up tweet is kept for inspection
+POST_JOURNAL_PATH = os.path.join(DATA_DIR, 'posted_news.journal')
+POST_JOURNAL_BATCH_SIZE = 20  # rows per bulk insert into posted_news
+POST_JOURNAL_FLUSH_INTERVAL = 15  # max seconds a journaled post waits before being flushed
+
+# Stats
+STATS_CACHE_TTL = 30  # seconds a computed stats snapshot is reused
+STATS_RESYNC_INTERVAL = 3600  # seconds between full counter resyncs from Supabase
+
+# Health Checks
+HEALTH_CHECK_INTERVAL = 120  # seconds between background health refreshes
+HEALTH_FRESH_TIMEOUT = 5  # max seconds a ?fresh=1 probe waits for checks
+HEALTH_STARTUP_DELAY = 10  # seconds after boot before the first background check
 
 # Bot Settings
 POSTING_INTERVAL = 5  # minutes
 MAX_RETRY_ATTEMPTS = 3
 REQUEST_TIMEOUT = 15
+CYCLE_DEADLINE = int(os.getenv('CYCLE_DEADLINE', 60))  # seconds a whole cycle may take
+CYCLE_GENERATE_RESERVE = 20  # seconds kept back for generation while fetching and filtering
+CYCLE_POST_RESERVE = 10  # seconds kept back for posting while generating
+CYCLE_MIN_STEP = 2  # seconds a call needs to be worth starting
+TWITTER_REQUEST_TIMEOUT = 15  # default HTTP timeout for Twitter API calls
+SCHEDULER_ENABLED = os.getenv('SCHEDULER_ENABLED', 'false').lower() == 'true'  # internal timer; leave off while /run is triggered externally, and run one process only
+SCHEDULER_JITTER = 30  # seconds of random jitter around each scheduled cycle
+SCHEDULER_MAX_JOBS = 100  # finished jobs kept for /jobs/<id>
+NO_NEWS_COOLDOWN = 300  # seconds to pause cycles after repeated failures
+FETCH_DEADLINE = 10  # seconds for a concurrent fan-out across all sources
+FETCH_MIN_ITEMS = 5  # stop waiting once this many articles have arrived
+HTTP_POOL_SIZE = 4  # keep-alive connections per news source host
+SOURCE_HEALTH_ALPHA = 0.3  # weight of the newest fetch in each source's rolling averages
+SOURCE_BREAKER_FAILURES = 3  # consecutive failed fetches that open a source's circuit
+SOURCE_BREAKER_COOLDOWN = 60  # seconds an open circuit waits before a half-open probe
+SOURCE_BREAKER_MAX_COOLDOWN = 900  # cap for the cooldown, doubled after each failed probe
+FETCH_MODE = os.getenv('FETCH_MODE', 'concurrent')  # 'concurrent' fan-out to all sources or 'hedged' single source
+HEDGE_PERCENTILE = 95  # hedge once the primary is slower than this percentile of its own latency
+HEDGE_BUDGET = 0.1  # hedged requests allowed per primary request
+HEDGE_MIN_SAMPLES = 10  # latency samples needed before the percentile is trusted
+HEDGE_DEFAULT_DELAY = 2.0  # seconds to wait before hedging a source with too few samples
 
-# News Sources
-NEWS_SOURCES = ['coingecko', 'coinranking', 'coinpaprika']
+# Twitter Posting
+# X counts posts per user per 24 hours; set the limit to the account's tier (17 on Free, 100 on Basic)
+TWITTER_POST_LIMIT = int(os.getenv('TWITTER_POST_LIMIT', 17))  # tweets per account per window
+TWITTER_POST_WINDOW = int(os.getenv('TWITTER_POST_WINDOW', 24 * 3600))  # seconds in the posting window
+TWITTER_MAX_FAILURES = 3  # consecutive errors before an account is benched
+TWITTER_FAILURE_COOLDOWN = 300  # seconds a benched account sits out
+
+# Feed Cache
+FEED_CACHE_TTL = int(os.getenv('FEED_CACHE_TTL', 180))  # seconds a parsed feed is served as fresh
+FEED_CACHE_STALE_GRACE = int(os.getenv('FEED_CACHE_STALE_GRACE', 900))  # seconds stale data may be served
+FEED_CACHE_MAX_ENTRIES = 32
 
 # Content Settings
 MAX_TWEET_LENGTH = 280
 MIN_NEWS_LENGTH = 50
 
+# Generation Settings
+TWEET_VARIANTS = int(os.getenv('TWEET_VARIANTS', 3))  # variants generated in parallel per article
+TWEET_VARIANT_STRATEGY = os.getenv('TWEET_VARIANT_STRATEGY', 'first')  # 'first' valid or 'best' scoring
+GENERATION_DEADLINE = 30  # seconds shared by all variants
+GENERATION_BATCH_SIZE = int(os.getenv('GENERATION_BATCH_SIZE', 4))  # articles per Gemini call; 1 turns batching off
+
 # Hashtag Mapping
 HASHTAG_MAPPING = {
     'bitcoin': ['Bitcoin', 'BTC', 'Crypto'],
@@ -1,7 +1,22 @@
 import requests
-import random
 import logging
-from config import RAPIDAPI_KEY, NEWS_SOURCES, REQUEST_TIMEOUT
+import threading
+import time
+from requests.adapters import HTTPAdapter
+from concurrent.futures import (
+    ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED, TimeoutError as FuturesTimeoutError
+)
+from .feed_cache import FeedCache
+from .news_schema import NEWS_SCHEMAS, NEWS_SOURCES, compile_schemas
+from .metrics import track_call
+from .deadline import Deadline
+from .source_health import SourceHealth
+from config import (
+    RAPIDAPI_KEY, REQUEST_TIMEOUT, FETCH_DEADLINE, FETCH_MIN_ITEMS, HTTP_POOL_SIZE,
+    HEDGE_PERCENTILE, HEDGE_BUDGET, HEDGE_DEFAULT_DELAY, CYCLE_MIN_STEP
+)
+
+READ_CHUNK_SIZE = 16384  # bytes read between cancellation checks
 
 class APIClient:
     def __init__(self):
@@ -9,52 +24,282 @@ class APIClient:
         self.rapidapi_key = RAPIDAPI_KEY
         
         self.api_configs = {
-            'coingecko': {
-                'url': 'https://coingecko.p.rapidapi.com/news',
-                'headers': {
-                    'X-RapidAPI-Key': self.rapidapi_key,
-                    'X-RapidAPI-Host': 'coingecko.p.rapidapi.com'
-                }
-            },
-            'coinranking': {
-                'url': 'https://coinranking1.p.rapidapi.com/news',
+            source: {
+                'url': schema['url'],
                 'headers': {
                     'X-RapidAPI-Key': self.rapidapi_key,
-                    'X-RapidAPI-Host': 'coinranking1.p.rapidapi.com'
-                }
-            },
-            'coinpaprika': {
-                'url': 'https://coinpaprika1.p.rapidapi.com/news',
-                'headers': {
-                    'X-RapidAPI-Key': self.rapidapi_key,
-                    'X-RapidAPI-Host': 'coinpaprika1.p.rapidapi.com'
+                    'X-RapidAPI-Host': schema['host']
                 }
             }
+            for source, schema in NEWS_SCHEMAS.items()
         }
+        self.extractors = compile_schemas(NEWS_SCHEMAS)
+
+        # One keep-alive session per source host, plus conditional GET validators
+        self.sessions = {}
+        self.validators = {}
+        self.transport_stats = {
+            source: {'requests': 0, 'not_modified': 0, 'bytes_saved': 0, 'handshakes_avoided': 0}
+            for source in self.api_configs
+        }
+        self._session_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+
+        self.feed_cache = FeedCache()
+        self.source_health = SourceHealth(self.api_configs)
+
+        # Hedged fetches: a second source is asked only when the first is unusually slow
+        self.hedge_executor = ThreadPoolExecutor(max_workers=len(self.api_configs) * 2, thread_name_prefix='news-hedge')
+        self.hedge_stats = {'requests': 0, 'hedges': 0, 'hedge_wins': 0, 'budget_denied': 0, 'fallbacks': 0}
+
+    def get_session(self, source):
+        """Get the pooled keep-alive session for a source, creating it on first use"""
+        with self._session_lock:
+            session = self.sessions.get(source)
+            if session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=HTTP_POOL_SIZE)
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                session.headers.update(self.api_configs[source]['headers'])
+                self.sessions[source] = session
+            return session
+
+    def get_transport_stats(self):
+        """Per-source counters for conditional GET savings and reused connections"""
+        with self._stats_lock:
+            stats = {source: dict(counters) for source, counters in self.transport_stats.items()}
+
+        with self._session_lock:
+            sessions = list(self.sessions.items())
+        for source, session in sessions:
+            url = self.api_configs[source]['url']
+            try:
+                pool = session.get_adapter(url).poolmanager.connection_from_url(url)
+                stats[source]['handshakes_avoided'] = max(pool.num_requests - pool.num_connections, 0)
+            except Exception:
+                pass
+        return stats
 
     def get_random_news(self):
-        """Get news from random API source"""
-        selected_source = random.choice(NEWS_SOURCES)
+        """Get news from a source picked by recent latency, error rate and yield"""
+        selected_source = self.source_health.choose(NEWS_SOURCES)
+        if selected_source is None:
+            self.logger.warning("🚫 Every news source circuit is open")
+            return None
         self.logger.info(f"🎲 Selected news source: {selected_source}")
         return self.get_news_from_source(selected_source)
 
-    def get_news_from_source(self, source):
-        """Get news from specific source"""
+    def iter_news_concurrently(self, sources=None, deadline=FETCH_DEADLINE, budget=None):
+        """Query all sources in parallel and yield (source, news_items) as each one answers"""
+        requested = list(sources or NEWS_SOURCES)
+        # Skip sources whose circuit is open; the healthiest go first
+        sources = self.source_health.available(requested)
+        if len(sources) < len(requested):
+            skipped = [source for source in requested if source not in sources]
+            self.logger.info(f"🚫 Skipping sources with open circuits: {', '.join(skipped)}")
+        if not sources:
+            return
+
+        executor = ThreadPoolExecutor(max_workers=len(sources), thread_name_prefix='news-fetch')
+        futures = {executor.submit(self.get_news_from_source, source, None, budget): source for source in sources}
+        try:
+            for future in as_completed(futures, timeout=deadline):
+                source = futures[future]
+                news_items = future.result()
+                if news_items:
+                    yield source, news_items
+        except FuturesTimeoutError:
+            pending = [futures[f] for f in futures if not f.done()]
+            self.logger.warning(f"⏰ Fetch deadline of {deadline}s reached, still waiting on: {', '.join(pending)}")
+        finally:
+            # Don't block on slow sources; their threads finish in the background
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def get_news_concurrently(self, sources=None, deadline=FETCH_DEADLINE, min_items=FETCH_MIN_ITEMS, budget=None):
+        """Fan out to all sources and merge results until min_items arrive or the deadline passes"""
+        merged = []
+        responded = []
+        for source, news_items in self.iter_news_concurrently(sources, deadline, budget):
+            merged.extend(news_items)
+            responded.append(source)
+            if min_items and len(merged) >= min_items:
+                break
+
+        if merged:
+            self.logger.info(f"⚡ Merged {len(merged)} items from {', '.join(responded)}")
+            return merged
+
+        self.logger.error("❌ No news source returned items before the deadline")
+        return None
+
+    def get_hedged_news(self, sources=None, deadline=FETCH_DEADLINE, budget=None):
+        """Fetch from the best source, asking the next-best too if the first is slower than usual"""
+        ranked = self.source_health.available(list(sources or NEWS_SOURCES))
+        if not ranked:
+            self.logger.warning("🚫 Every news source circuit is open")
+            return None
+
+        primary, backups = ranked[0], ranked[1:]
+        hedge_after = self.source_health.latency_percentile(primary, HEDGE_PERCENTILE) or HEDGE_DEFAULT_DELAY
+        with self._stats_lock:
+            self.hedge_stats['requests'] += 1
+
+        futures = {}
+        cancels = []
+
+        def launch(source):
+            cancel = threading.Event()
+            cancels.append(cancel)
+            future = self.hedge_executor.submit(self.get_news_from_source, source, cancel, budget)
+            futures[future] = source
+            return future
+
+        started = time.monotonic()
+        pending = {launch(primary)}
+        try:
+            done, pending = wait(pending, timeout=min(hedge_after, deadline))
+            if pending and backups and self._take_hedge():
+                self.logger.info(f"🪝 {primary} slower than its p{HEDGE_PERCENTILE} ({hedge_after * 1000:.0f} ms), hedging with {backups[0]}")
+                pending.add(launch(backups.pop(0)))
+
+            while done or pending:
+                for future in done:
+                    news_items = future.result()
+                    if news_items:
+                        if futures[future] != primary:
+                            with self._stats_lock:
+                                self.hedge_stats['hedge_wins'] += 1
+                        return news_items
+
+                if not pending:
+                    if not backups:
+                        break
+                    # Everything asked so far failed: fall back to the next source
+                    with self._stats_lock:
+                        self.hedge_stats['fallbacks'] += 1
+                    pending = {launch(backups.pop(0))}
+
+                remaining = deadline - (time.monotonic() - started)
+                if remaining <= 0:
+                    self.logger.warning(f"⏰ Fetch deadline of {deadline}s reached, still waiting on: "
+                                        f"{', '.join(futures[f] for f in pending)}")
+                    break
+                done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+
+            self.logger.error("❌ No news source returned items before the deadline")
+            return None
+        finally:
+            # The loser stops reading its body at the next chunk
+            for cancel in cancels:
+                cancel.set()
+
+    def _take_hedge(self):
+        """Spend one hedge if that keeps hedges within HEDGE_BUDGET of primary requests"""
+        with self._stats_lock:
+            if self.hedge_stats['hedges'] + 1 > HEDGE_BUDGET * self.hedge_stats['requests']:
+                self.hedge_stats['budget_denied'] += 1
+                return False
+            self.hedge_stats['hedges'] += 1
+            return True
+
+    def get_hedge_stats(self):
+        with self._stats_lock:
+            return dict(self.hedge_stats)
+
+    def get_news_from_source(self, source, cancel=None, budget=None):
+        """Get news from specific source, served from the feed cache when fresh"""
+        if source not in self.api_configs:
+            self.logger.error(f"❌ Unknown news source: {source}")
+            return None
+        # A background refresh outlives this call, so a hedge's cancel must not reach it
+        return self.feed_cache.get(source, lambda: self.fetch_with_breaker(source, cancel, budget),
+                                   refresher=lambda: self.fetch_with_breaker(source, None, budget))
+
+    def fetch_with_breaker(self, source, cancel=None, budget=None):
+        """Fetch through the source's circuit breaker, recording the outcome in its health"""
+        if budget is not None and not budget.has(CYCLE_MIN_STEP):
+            # Also covers background refreshes started after the cycle's budget ran out
+            self.logger.info(f"⏰ Not enough cycle budget left to fetch {source}")
+            return None
+        if not self.source_health.allow(source):
+            self.logger.info(f"🚫 {source} circuit is open, skipping fetch")
+            return None
+        started = time.perf_counter()
+        news_items = None
+        try:
+            news_items = self.fetch_news_from_source(source, cancel, budget)
+            return news_items
+        finally:
+            if news_items is None and cancel is not None and cancel.is_set():
+                # Cancelled by a faster hedge: says nothing about the source's health
+                self.source_health.release(source)
+            else:
+                self.source_health.record(
+                    source,
+                    ok=news_items is not None,
+                    latency=time.perf_counter() - started,
+                    items=len(news_items or ())
+                )
+
+    def fetch_news_from_source(self, source, cancel=None, budget=None):
+        """Fetch news from specific source over the network; setting cancel abandons the read"""
+        budget = budget or Deadline.unbounded()
         try:
             if source not in self.api_configs:
                 self.logger.error(f"❌ Unknown news source: {source}")
                 return None
             
             config = self.api_configs[source]
-            response = requests.get(
-                config['url'],
-                headers=config['headers'],
-                timeout=REQUEST_TIMEOUT
-            )
-            
+            cached = self.validators.get(source)
+            headers = {}
+            if cached:
+                if cached.get('etag'):
+                    headers['If-None-Match'] = cached['etag']
+                if cached.get('last_modified'):
+                    headers['If-Modified-Since'] = cached['last_modified']
+
+            with track_call('rapidapi', source) as call:
+                response = self.get_session(source).get(
+                    config['url'],
+                    headers=headers,
+                    timeout=budget.timeout(REQUEST_TIMEOUT, floor=CYCLE_MIN_STEP),
+                    stream=True
+                )
+                body = self._read_body(response, cancel)
+                if body is None:
+                    call.outcome = 'cancelled'
+                    self.logger.info(f"✂️ {source} fetch cancelled, a faster source answered")
+                    return None
+                call.payload_bytes = len(body)
+                if response.status_code == 304:
+                    call.outcome = 'not_modified'
+                elif response.status_code != 200:
+                    call.outcome = f'http_{response.status_code}'
+
+            with self._stats_lock:
+                self.transport_stats[source]['requests'] += 1
+
+            if response.status_code == 304 and cached:
+                # Feed unchanged: reuse the items parsed last time
+                with self._stats_lock:
+                    self.transport_stats[source]['not_modified'] += 1
+                    self.transport_stats[source]['bytes_saved'] += cached['body_size']
+                self.logger.info(f"♻️ {source} feed not modified, reusing {len(cached['items'])} items")
+                return list(cached['items'])
+
             if response.status_code == 200:
-                data = response.json()
-                news_items = self.parse_news_response(data, source)
+                # JSON bodies are UTF-8; skip requests' charset sniffing
+                news_items = self.parse_news_body(body.decode('utf-8', errors='replace'), source)
+                etag = response.headers.get('ETag')
+                last_modified = response.headers.get('Last-Modified')
+                if etag or last_modified:
+                    self.validators[source] = {
+                        'etag': etag,
+                        'last_modified': last_modified,
+                        'body_size': len(body),
+                        'items': list(news_items)
+                    }
                 self.logger.info(f"✅ Successfully fetched {len(news_items)} items from {source}")
                 return news_items
             else:
@@ -68,60 +313,43 @@ class APIClient:
             self.logger.error(f"❌ Exception in {source}: {e}")
             return None
 
+    @staticmethod
+    def _read_body(response, cancel):
+        """Read a streamed body in chunks, or None if cancel is set before it's complete"""
+        if cancel is None:
+            return response.content
+        chunks = []
+        try:
+            for chunk in response.iter_content(chunk_size=READ_CHUNK_SIZE):
+                if cancel.is_set():
+                    return None
+                chunks.append(chunk)
+        finally:
+            if cancel.is_set():
+                # Drop the half-read connection instead of returning it to the pool
+                response.close()
+        return b''.join(chunks)
+
     def parse_news_response(self, data, source):
-        """Parse API response based on source"""
-        news_items = []
-        
+        """Parse a decoded API response using the source's schema"""
         try:
-            if source == 'coingecko':
-                articles = data.get('data', {}).get('news', [])
-                for article in articles[:10]:  # Get top 10
-                    if self.is_valid_article(article):
-                        news_items.append({
-                            'title': article.get('title', '').strip(),
-                            'description': article.get('description', '').strip(),
-                            'url': article.get('url', ''),
-                            'published_at': article.get('created_at', ''),
-                            'source': source,
-                            'author': article.get('author', '')
-                        })
-                        
-            elif source == 'coinranking':
-                articles = data.get('data', {}).get('news', [])
-                for article in articles[:10]:
-                    if self.is_valid_article(article):
-                        news_items.append({
-                            'title': article.get('title', '').strip(),
-                            'description': article.get('description', '').strip(),
-                            'url': article.get('url', ''),
-                            'published_at': article.get('published_at', ''),
-                            'source': source,
-                            'author': article.get('author', '')
-                        })
-                        
-            elif source == 'coinpaprika':
-                articles = data[:10]  # CoinPaprika returns list directly
-                for article in articles:
-                    if self.is_valid_article(article):
-                        news_items.append({
-                            'title': article.get('title', '').strip(),
-                            'description': article.get('description', '').strip(),
-                            'url': article.get('url', ''),
-                            'published_at': article.get('date', ''),
-                            'source': source,
-                            'author': article.get('author', '')
-                        })
-            
-            return news_items
-            
+            return self.extractors[source].extract_from_data(data, self.is_valid_article)
+        except Exception as e:
+            self.logger.error(f"❌ Error parsing {source} response: {e}")
+            return []
+
+    def parse_news_body(self, body, source):
+        """Parse a raw API response body, decoding only the articles that are kept"""
+        try:
+            return self.extractors[source].extract_from_text(body, self.is_valid_article)
         except Exception as e:
             self.logger.error(f"❌ Error parsing {source} response: {e}")
             return []
 
     def is_valid_article(self, article):
         """Validate article has minimum required data"""
-        title = article.get('title', '').strip()
-        description = article.get('description', '').strip()
+        title = (article.get('title') or '').strip()
+        description = (article.get('description') or '').strip()
         
         return (
             len(title) >= 10 and 
@@ -1,105 +1,250 @@
 import logging
+import threading
 import time
 import random
-from datetime import datetime
+from datetime import datetime, timedelta
 from .api_clients import APIClient
+from .deadline import Deadline
 from .content_generator import ContentGenerator
 from .twitter_manager import TwitterManager
 from .database import DatabaseManager
 from .news_manager import NewsManager
+from .news_schema import NEWS_SOURCES
+from .post_outbox import PostOutbox
+from .metrics import track_stage, CYCLE_DURATION, CYCLE_TOTAL
+from .startup_profile import startup_profile
+from config import (
+    NO_NEWS_COOLDOWN, FETCH_MODE, FETCH_DEADLINE, CYCLE_DEADLINE, CYCLE_GENERATE_RESERVE,
+    CYCLE_POST_RESERVE, CYCLE_MIN_STEP, GENERATION_BATCH_SIZE, SIMILARITY_WINDOW_DAYS
+)
 
 class CryptoBot:
-    def __init__(self):
+    component_factories = {
+        'db': DatabaseManager,
+        'api_client': APIClient,
+        'content_gen': ContentGenerator,
+        'twitter': TwitterManager,
+        'news_manager': NewsManager,
+        'outbox': PostOutbox
+    }
+
+    def __init__(self, db=None, api_client=None, content_gen=None, twitter=None, news_manager=None, outbox=None):
         self.logger = logging.getLogger(__name__)
         
-        # Initialize components
-        self.db = DatabaseManager()
-        self.api_client = APIClient()
-        self.content_gen = ContentGenerator()
-        self.twitter = TwitterManager()
-        self.news_manager = NewsManager()
+        # Components are built lazily on first use (pass any of them in to use a stand-in)
+        self._components = {
+            name: component for name, component in (
+                ('db', db), ('api_client', api_client), ('content_gen', content_gen),
+                ('twitter', twitter), ('news_manager', news_manager), ('outbox', outbox)
+            ) if component is not None
+        }
+        self._component_lock = threading.RLock()
         
         self.consecutive_failures = 0
         self.max_consecutive_failures = 5
+        self.paused_until = 0
         
         self.logger.info("✅ Crypto Bot initialized successfully")
 
-    def run_single_cycle(self):
-        """Run one complete bot cycle"""
+    def _component(self, name):
+        component = self._components.get(name)
+        if component is None:
+            with self._component_lock:
+                component = self._components.get(name)
+                if component is None:
+                    with startup_profile.measure(name, 'init'):
+                        component = self.component_factories[name]()
+                    self._components[name] = component
+                    if name == 'news_manager' and component.needs_similarity_seed:
+                        threading.Thread(
+                            target=self.seed_similarity_index, name='similarity-seed', daemon=True
+                        ).start()
+        return component
+
+    def seed_similarity_index(self):
+        """Fill a fresh near-duplicate index from the posts stored within its window"""
         try:
-            self.logger.info("🔄 Starting bot cycle...")
-            
-            # Step 1: Get news from random API
-            news_data = self.get_news_with_fallback()
-            if not news_data:
-                self.handle_no_news()
-                return False
-
-            # Step 2: Filter and select best news
-            selected_news = self.select_best_news(news_data)
-            if not selected_news:
-                self.logger.warning("📭 No suitable news after filtering")
-                return False
-
-            # Step 3: Check for duplicates
-            if self.db.is_news_posted(selected_news['title']):
-                self.logger.info("📝 News already posted, skipping...")
-                return False
-
-            # Step 4: Generate high-quality tweet
-            tweet_content = self.content_gen.create_high_quality_tweet(selected_news)
-            if not tweet_content:
-                self.logger.error("❌ Failed to generate tweet content")
-                return False
-
-            # Step 5: Post to Twitter
-            if self.twitter.post_tweet(tweet_content):
-                self.db.mark_news_as_posted(
-                    title=selected_news['title'],
-                    url=selected_news.get('url', ''),
-                    content=tweet_content,
-                    source=selected_news.get('source', 'unknown')
-                )
-                self.consecutive_failures = 0
-                self.logger.info("✅ Tweet posted successfully!")
-                return True
-            else:
-                self.logger.error("❌ Failed to post tweet")
-                return False
+            # After a wiped disk the local store only has the full history once the backfill is done
+            self.db.history_complete.wait()
+            since = (datetime.now() - timedelta(days=SIMILARITY_WINDOW_DAYS)).isoformat()
+            rows = self.db.iter_posts_since(since, fields=('title', 'content', 'posted_at'))
+            self.news_manager.seed_similarity_index(rows)
+        except Exception as e:
+            self.logger.error(f"❌ Error seeding similarity index: {e}")
+
+    @property
+    def db(self):
+        return self._component('db')
+
+    @property
+    def api_client(self):
+        return self._component('api_client')
+
+    @property
+    def content_gen(self):
+        return self._component('content_gen')
+
+    @property
+    def twitter(self):
+        return self._component('twitter')
+
+    @property
+    def news_manager(self):
+        return self._component('news_manager')
+
+    @property
+    def outbox(self):
+        return self._component('outbox')
+
+    def run_single_cycle(self, budget=None):
+        """Run one complete bot cycle within its deadline"""
+        started = time.perf_counter()
+        budget = budget or Deadline(CYCLE_DEADLINE)
+        outcome = 'error'
+        try:
+            outcome = self._run_cycle_stages(budget)
+            if budget.expired():
+                self.logger.warning(f"⏱️ Cycle overran its {budget.budget}s deadline by "
+                                    f"{budget.elapsed() - budget.budget:.1f}s ({outcome})")
+            return outcome == 'posted'
 
         except Exception as e:
             self.logger.error(f"❌ Error in bot cycle: {e}")
             self.consecutive_failures += 1
             return False
+        finally:
+            CYCLE_DURATION.observe(time.perf_counter() - started)
+            CYCLE_TOTAL.inc(outcome=outcome)
+
+    def _run_cycle_stages(self, budget):
+        """Run the cycle stages and return the cycle outcome"""
+        if time.monotonic() < self.paused_until:
+            remaining = int(self.paused_until - time.monotonic())
+            self.logger.info(f"😴 Taking a break after repeated failures, {remaining}s left")
+            return 'paused'
 
-    def get_news_with_fallback(self):
-        """Get news with fallback to other APIs if one fails"""
-        news_data = self.api_client.get_random_news()
+        self.logger.info("🔄 Starting bot cycle...")
         
+        # Step 1: Get news from random API
+        with track_stage('fetch') as stage:
+            news_data = self.get_news_with_fallback(budget)
+            if not news_data:
+                stage.outcome = 'empty'
         if not news_data:
-            # Try all APIs sequentially
-            for source in ['coingecko', 'coinranking', 'coinpaprika']:
-                self.logger.info(f"🔄 Trying fallback API: {source}")
-                news_data = self.api_client.get_news_from_source(source)
-                if news_data:
-                    break
-                time.sleep(1)  # Rate limiting
-        
-        return news_data
+            self.handle_no_news()
+            return 'no_news'
+        if budget.expired():
+            return 'deadline_exceeded'
+
+        # Step 2 & 3: Filter, drop already-posted items and select the best remaining news
+        candidates = self.select_candidates(news_data, budget)
+        if not candidates:
+            self.logger.warning("📭 No suitable unposted news after filtering")
+            return 'no_candidates'
+        if budget.expired():
+            return 'deadline_exceeded'
+
+        # Step 4: Generate high-quality tweet
+        with track_stage('generate') as stage:
+            selected_news = candidates[0]
+            tweet_content = self.content_gen.create_high_quality_tweet(selected_news, budget, upcoming=candidates[1:])
+            if not tweet_content:
+                stage.outcome = 'failed'
+        if not tweet_content:
+            self.logger.error("❌ Failed to generate tweet content")
+            return 'generation_failed'
 
-    def select_best_news(self, news_data):
-        """Select the best news item based on quality score"""
+        # Step 5: Queue the tweet durably, then post it to Twitter
+        with track_stage('post') as stage:
+            entry_id = self.outbox.enqueue(selected_news, tweet_content, list(self.twitter.accounts))
+            if budget.has(CYCLE_MIN_STEP):
+                status = self.outbox.deliver_now(
+                    entry_id, lambda contents: self.twitter.post_to_accounts(contents, budget), self.confirm_post
+                )
+            else:
+                # Out of time: the outbox worker posts it shortly
+                status = 'pending'
+            if status != 'posted':
+                stage.outcome = 'queued' if status == 'pending' else 'failed'
+
+        if status == 'posted':
+            self.consecutive_failures = 0
+            self.logger.info("✅ Tweet posted successfully!")
+            return 'posted'
+        elif status == 'pending':
+            self.logger.warning("📮 Tweet kept in the outbox, it will be retried")
+            return 'post_queued'
+        else:
+            self.logger.error("❌ Failed to post tweet")
+            return 'post_failed'
+
+    def confirm_post(self, news_item, content):
+        """Record a tweet Twitter accepted; called once per outbox entry"""
+        if not self.db.mark_news_as_posted(
+            title=news_item.title,
+            url=news_item.url,
+            content=content,
+            source=news_item.source
+        ):
+            return False
+        self.news_manager.remember_posted(news_item)
+        # Drop the article's ready tweets so the cache only holds ones still waiting to be posted
+        self.content_gen.forget_article(news_item)
+        return True
+
+    def drain_outbox(self):
+        """Retry queued tweets that are due; returns how many got posted"""
+        return self.outbox.drain(self.twitter.post_to_accounts, self.confirm_post)
+
+    def get_news_with_fallback(self, budget=None):
+        """Get news from all APIs concurrently, or from one source hedged by the next-best"""
+        budget = budget or Deadline.unbounded()
+        # Leave the later stages their share of the cycle
+        deadline = budget.timeout(FETCH_DEADLINE, reserve=CYCLE_GENERATE_RESERVE + CYCLE_POST_RESERVE,
+                                  floor=CYCLE_MIN_STEP)
+        if FETCH_MODE == 'hedged':
+            return self.api_client.get_hedged_news(deadline=deadline, budget=budget)
+        return self.api_client.get_news_concurrently(deadline=deadline, budget=budget)
+
+    def select_best_news(self, news_data, budget=None):
+        """Select the best unposted news item based on quality score"""
+        candidates = self.select_candidates(news_data, budget, limit=1)
+        return candidates[0] if candidates else None
+
+    def select_candidates(self, news_data, budget=None, limit=GENERATION_BATCH_SIZE):
+        """Best unposted news items, highest quality first"""
         if not news_data:
-            return None
+            return []
             
         # Filter news
-        filtered_news = self.news_manager.filter_news(news_data)
+        with track_stage('filter') as stage:
+            filtered_news = self.news_manager.filter_news(news_data)
+            if not filtered_news:
+                stage.outcome = 'empty'
         if not filtered_news:
-            return None
-            
-        # Sort by quality score and return the best one
-        filtered_news.sort(key=lambda x: x.get('quality_score', 0), reverse=True)
-        return filtered_news[0]
+            return []
+
+        with track_stage('dedup') as stage:
+            # Check every candidate against posted history in one lookup, skipping tweets already queued
+            unposted_news = self.db.filter_unposted(filtered_news, budget)
+            queued_titles = self.outbox.pending_titles()
+            if queued_titles:
+                unposted_news = [item for item in unposted_news if item.title not in queued_titles]
+            if not unposted_news:
+                stage.outcome = 'all_posted'
+                self.logger.info("📝 All candidates already posted, skipping...")
+                return []
+                
+            # Candidates arrive ranked; keep the best ones that aren't near-duplicates
+            candidates = []
+            for news_item in unposted_news:
+                if not self.news_manager.is_near_duplicate(news_item):
+                    candidates.append(news_item)
+                    if len(candidates) >= limit:
+                        break
+            if not candidates:
+                stage.outcome = 'all_similar'
+            return candidates
 
     def handle_no_news(self):
         """Handle situation when no news is available"""
@@ -108,7 +253,8 @@ class CryptoBot:
         
         if self.consecutive_failures >= self.max_consecutive_failures:
             self.logger.warning("🔄 Too many consecutive failures, taking a break...")
-            time.sleep(300)  # 5 minutes break
+            # Pause upcoming cycles instead of sleeping inside the caller
+            self.paused_until = time.monotonic() + NO_NEWS_COOLDOWN
             self.consecutive_failures = 0
 
     def test_all_apis(self):
@@ -123,9 +269,9 @@ class CryptoBot:
             results['twitter'] = f'error: {str(e)}'
         
         # Test News APIs
-        for source in ['coingecko', 'coinranking', 'coinpaprika']:
+        for source in NEWS_SOURCES:
             try:
-                news_data = self.api_client.get_news_from_source(source)
+                news_data = self.api_client.fetch_news_from_source(source)
                 results[source] = f'connected ({len(news_data) if news_data else 0} items)'
             except Exception as e:
                 results[source] = f'error: {str(e)}'
@@ -1,12 +1,34 @@
-import google.generativeai as genai
+import json
 import logging
 import random
-from config import GEMINI_API_KEY, HASHTAG_MAPPING
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeoutError
+from .deadline import Deadline
+from .keyword_matcher import KeywordMatcher
+from .metrics import track_call
+from .startup_profile import startup_profile
+from .tweet_cache import TweetCache
+from config import (
+    GEMINI_API_KEY, HASHTAG_MAPPING, MAX_TWEET_LENGTH,
+    TWEET_VARIANTS, TWEET_VARIANT_STRATEGY, GENERATION_DEADLINE, GENERATION_BATCH_SIZE,
+    CYCLE_GENERATE_RESERVE, CYCLE_POST_RESERVE, CYCLE_MIN_STEP
+)
 
 class ContentGenerator:
-    def __init__(self):
+    def __init__(self, model=None):
         self.logger = logging.getLogger(__name__)
-        self.setup_gemini()
+        if model is not None:
+            self.model = model
+        else:
+            self.setup_gemini()
+        self.hashtag_matcher = KeywordMatcher(HASHTAG_MAPPING)
+        self.tweet_cache = TweetCache()
+        # The pinned SDK has no per-request timeout, so calls with a deadline run here and are waited on
+        gemini_workers = max(TWEET_VARIANTS, 1) + 1
+        self.gemini_executor = ThreadPoolExecutor(max_workers=gemini_workers, thread_name_prefix='gemini')
+        # One slot per worker: calls never queue behind hung ones and then run once Gemini recovers
+        self.gemini_slots = threading.BoundedSemaphore(gemini_workers)
         
         self.tweet_styles = [
             "breaking_news",
@@ -27,6 +49,9 @@ class ContentGenerator:
     def setup_gemini(self):
         """Setup Gemini AI"""
         try:
+            # Imported here so the SDK's import cost is paid on first use, not at app startup
+            with startup_profile.measure('gemini', 'import'):
+                import google.generativeai as genai
             genai.configure(api_key=GEMINI_API_KEY)
             self.model = genai.GenerativeModel('gemini-pro')
             self.logger.info("✅ Gemini AI configured successfully")
@@ -34,24 +59,54 @@ class ContentGenerator:
             self.logger.error(f"❌ Gemini setup failed: {e}")
             raise
 
-    def create_high_quality_tweet(self, news_item):
-        """Create high-quality, engaging tweet"""
+    def create_high_quality_tweet(self, news_item, budget=None, upcoming=None):
+        """Create high-quality, engaging tweet, batching in upcoming articles when given"""
+        budget = budget or Deadline.unbounded()
         try:
-            style = random.choice(self.tweet_styles)
+            # Reuse a tweet already generated and validated for this article
+            article_key = self.tweet_cache.article_key(news_item)
+            cached_tweet = self.tweet_cache.get(article_key)
+            if cached_tweet:
+                self.logger.info("♻️ Reusing cached tweet for this article")
+                return cached_tweet
+
+            # Leave time for posting; Gemini only gets what's left of the cycle
+            timeout = budget.timeout(GENERATION_DEADLINE, reserve=CYCLE_POST_RESERVE, floor=CYCLE_MIN_STEP)
+            if timeout < CYCLE_MIN_STEP:
+                self.logger.warning(f"⏰ Only {timeout:.1f}s of cycle budget left, skipping generation")
+                return None
+
+            # One call writes tweets for the next few candidates too; they wait in the cache
+            if GENERATION_BATCH_SIZE > 1 and upcoming:
+                batch = [news_item] + [item for item in upcoming
+                                       if not self.tweet_cache.contains(self.tweet_cache.article_key(item))]
+                tweets = self.generate_batch(batch[:GENERATION_BATCH_SIZE], timeout=timeout)
+                if article_key in tweets:
+                    self.logger.info(f"✅ High-quality tweet generated in a batch of {len(tweets)}")
+                    return tweets[article_key]
+
+                # Fall back to a dedicated call for this article if there's still time
+                timeout = budget.timeout(GENERATION_DEADLINE, reserve=CYCLE_POST_RESERVE, floor=CYCLE_MIN_STEP)
+                if timeout < CYCLE_MIN_STEP:
+                    self.logger.warning("⏰ No cycle budget left after the batch, skipping generation")
+                    return None
+
             hashtags = self.generate_smart_hashtags(news_item)
-            
-            prompt = self.create_advanced_prompt(news_item, style, hashtags)
-            
-            response = self.model.generate_content(prompt)
-            tweet_text = response.text.strip()
-            
-            # Clean and validate tweet
-            tweet_text = self.clean_tweet(tweet_text)
-            
-            if not self.validate_tweet_quality(tweet_text):
+
+            # Extra variants are optional: drop them when the cycle is running short
+            if TWEET_VARIANTS > 1 and budget.has(CYCLE_GENERATE_RESERVE + CYCLE_POST_RESERVE):
+                variant = self.generate_best_variant(news_item, hashtags, deadline=timeout)
+            else:
+                variant = self.generate_variant(news_item, random.choice(self.tweet_styles), hashtags, timeout=timeout)
+                if variant and not self.validate_tweet_quality(variant[1]):
+                    variant = None
+
+            if not variant:
                 self.logger.warning("❌ Generated tweet failed quality check")
                 return None
-            
+
+            style, tweet_text, latency = variant
+            self.tweet_cache.put(article_key, style, tweet_text, latency)
             self.logger.info("✅ High-quality tweet generated successfully")
             return tweet_text
             
@@ -59,6 +114,154 @@ class ContentGenerator:
             self.logger.error(f"❌ Error generating tweet: {e}")
             return None
 
+    def forget_article(self, news_item):
+        """Discard cached tweets for an article once it has been posted"""
+        self.tweet_cache.discard(self.tweet_cache.article_key(news_item))
+
+    def generate_variant(self, news_item, style, hashtags, temperature=None, timeout=None):
+        """Generate and clean one tweet; returns (style, text, latency) or None"""
+        try:
+            prompt = self.create_advanced_prompt(news_item, style, hashtags)
+            generation_config = {'temperature': temperature} if temperature is not None else None
+
+            started = time.perf_counter()
+            with track_call('gemini', 'generate_content') as call:
+                response = self.call_gemini(prompt, generation_config, timeout)
+                call.payload_bytes = len(prompt) + len(response.text)
+            latency = time.perf_counter() - started
+
+            return style, self.clean_tweet(response.text.strip()), latency
+        except Exception as e:
+            self.logger.error(f"❌ Error generating {style} variant: {e}")
+            return None
+
+    def call_gemini(self, prompt, generation_config=None, timeout=None):
+        """Call Gemini, giving up on the response after timeout seconds"""
+        if not timeout:
+            return self.model.generate_content(prompt, generation_config=generation_config)
+        if not self.gemini_slots.acquire(blocking=False):
+            raise TimeoutError("Every Gemini worker is still waiting on an earlier call")
+        future = self.gemini_executor.submit(self._generate_in_slot, prompt, generation_config)
+        try:
+            return future.result(timeout=timeout)
+        except FuturesTimeoutError:
+            if future.cancel():
+                self.gemini_slots.release()  # never started, so it won't release its own slot
+            raise TimeoutError(f"Gemini gave no response within {timeout:.1f}s")
+
+    def _generate_in_slot(self, prompt, generation_config):
+        try:
+            return self.model.generate_content(prompt, generation_config=generation_config)
+        finally:
+            self.gemini_slots.release()
+
+    def generate_batch(self, news_items, timeout=None):
+        """Write one tweet per article in a single call; valid ones are cached by article key"""
+        if not news_items:
+            return {}
+        try:
+            styles = [random.choice(self.tweet_styles) for _ in news_items]
+            prompt = self.create_batch_prompt(news_items, styles)
+
+            started = time.perf_counter()
+            with track_call('gemini', 'generate_batch') as call:
+                response = self.call_gemini(prompt, timeout=timeout)
+                call.payload_bytes = len(prompt) + len(response.text)
+            latency = time.perf_counter() - started
+
+            generated = self.parse_batch_response(response.text, len(news_items))
+        except Exception as e:
+            self.logger.error(f"❌ Error generating tweet batch: {e}")
+            return {}
+
+        tweets = {}
+        for index, news_item in enumerate(news_items):
+            tweet_text = self.clean_tweet(generated.get(index, ''))
+            if self.validate_tweet_quality(tweet_text):
+                tweets[self.tweet_cache.article_key(news_item)] = (styles[index], tweet_text)
+
+        if tweets:
+            # Each cached tweet saved its share of the call
+            share = latency / len(tweets)
+            self.tweet_cache.put_many([(key, style, text, share) for key, (style, text) in tweets.items()])
+        self.logger.info(f"📦 Batch generated {len(tweets)} of {len(news_items)} tweets in {latency:.1f}s")
+        return {key: text for key, (style, text) in tweets.items()}
+
+    def parse_batch_response(self, text, count):
+        """Map article index to tweet text from the model's JSON, tolerating code fences around it"""
+        start, end = text.find('['), text.rfind(']')
+        if start == -1 or end < start:
+            self.logger.warning("⚠️ Batch response had no JSON array")
+            return {}
+        try:
+            rows = json.loads(text[start:end + 1])
+        except ValueError as e:
+            self.logger.warning(f"⚠️ Batch response was not valid JSON: {e}")
+            return {}
+
+        generated = {}
+        for row in rows:
+            if not isinstance(row, dict) or not isinstance(row.get('tweet'), str):
+                continue
+            try:
+                index = int(row.get('id')) - 1
+            except (TypeError, ValueError):
+                continue
+            if 0 <= index < count:
+                generated.setdefault(index, row['tweet'].strip())
+        return generated
+
+    def generate_best_variant(self, news_item, hashtags, n=TWEET_VARIANTS,
+                              deadline=GENERATION_DEADLINE, strategy=TWEET_VARIANT_STRATEGY):
+        """Generate n variants in parallel and pick the first valid or the best-scoring one"""
+        styles = random.sample(self.tweet_styles, len(self.tweet_styles))
+        temperatures = [0.7, 0.9, 1.0]
+        variants = [(styles[i % len(styles)], temperatures[i % len(temperatures)]) for i in range(n)]
+
+        executor = ThreadPoolExecutor(max_workers=n, thread_name_prefix='tweet-variant')
+        futures = [
+            executor.submit(self.generate_variant, news_item, style, hashtags, temperature, deadline)
+            for style, temperature in variants
+        ]
+        valid = []
+        try:
+            for future in as_completed(futures, timeout=deadline):
+                variant = future.result()
+                if not variant or not self.validate_tweet_quality(variant[1]):
+                    continue
+                if strategy == 'first':
+                    self.logger.info(f"🏁 Using first valid variant ({variant[0]})")
+                    return variant
+                valid.append(variant)
+        except FuturesTimeoutError:
+            self.logger.warning(f"⏰ Generation deadline of {deadline}s reached with {len(valid)} valid variants")
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        if not valid:
+            return None
+        best = max(valid, key=lambda variant: self.score_tweet(variant[1]))
+        self.logger.info(f"🏆 Picked best of {len(valid)} valid variants ({best[0]})")
+        return best
+
+    def score_tweet(self, tweet_text):
+        """Heuristic engagement score used to rank valid variants"""
+        score = 0.0
+
+        # Prefer using most of the space without crowding the limit
+        score += 1.0 - abs(len(tweet_text) - 220) / MAX_TWEET_LENGTH
+
+        hashtag_count = tweet_text.count('#')
+        if 2 <= hashtag_count <= 3:
+            score += 1.0
+        elif hashtag_count > 3:
+            score -= 0.5 * (hashtag_count - 3)
+
+        if '?' in tweet_text:
+            score += 0.5  # ends with a question / call-to-action
+
+        return score
+
     def create_advanced_prompt(self, news_item, style, hashtags):
         """Create advanced prompt for high-quality content"""
         
@@ -67,9 +270,9 @@ class ContentGenerator:
         The tweet should be professional, insightful, and highly engaging for crypto enthusiasts.
         
         NEWS INFORMATION:
-        Title: {news_item.get('title', '')}
-        Description: {news_item.get('description', '')}
-        Source: {news_item.get('source', 'unknown')}
+        Title: {news_item.title}
+        Description: {news_item.description}
+        Source: {news_item.source}
         
         STYLE: {style}
         MAX LENGTH: 275 characters (including hashtags)
@@ -92,28 +295,75 @@ class ContentGenerator:
         - Market Analysis: Price implications, trading insights
         
         EXAMPLES OF EXCELLENT TWEETS:
-        - "BREAKING: {news_item.get('title', 'Major crypto development')} just hit the market! This could significantly impact {random.choice(['BTC', 'ETH', 'DeFi'])} valuations. What's your take? 🚀 #CryptoNews #{random.choice(hashtags)}"
-        - "Deep dive: {news_item.get('title', 'This development')} reveals interesting market dynamics. Here's why this matters for traders and investors... 📊 #CryptoAnalysis #Trading"
+        - "BREAKING: {news_item.title or 'Major crypto development'} just hit the market! This could significantly impact {random.choice(['BTC', 'ETH', 'DeFi'])} valuations. What's your take? 🚀 #CryptoNews #{random.choice(hashtags)}"
+        - "Deep dive: {news_item.title or 'This development'} reveals interesting market dynamics. Here's why this matters for traders and investors... 📊 #CryptoAnalysis #Trading"
         
         Return ONLY the final tweet text, nothing else.
         """
         
         return base_prompt
 
+    def create_batch_prompt(self, news_items, styles):
+        """Create one prompt for several articles; the instructions are sent once for all of them"""
+        articles = '\n'.join(
+            f"""
+        ARTICLE {index}:
+        Title: {news_item.title}
+        Description: {news_item.description}
+        Source: {news_item.source}
+        Style: {style}
+        Hashtags: {self.generate_smart_hashtags(news_item)}"""
+            for index, (news_item, style) in enumerate(zip(news_items, styles), 1)
+        )
+
+        batch_prompt = f"""
+        Create one HIGH-QUALITY, ENGAGING Twitter post for EACH cryptocurrency news article below.
+        Every tweet should be professional, insightful, and highly engaging for crypto enthusiasts.
+        
+        MAX LENGTH: 275 characters per tweet (including hashtags)
+        
+        QUALITY REQUIREMENTS:
+        1. Start with a compelling hook that grabs attention
+        2. Provide valuable insight or analysis about the news
+        3. Use appropriate crypto terminology and show expertise
+        4. Include 2-3 relevant hashtags, taken from the article's list
+        5. Add 1-2 professional emojis that enhance the message
+        6. End with a thought-provoking question or call-to-action when appropriate
+        7. Sound authoritative but not robotic
+        8. Focus on what this means for the crypto market/community
+        9. Write each tweet only about its own article
+        
+        STYLE GUIDELINES:
+        - Breaking News: Urgent, timely, highlight importance
+        - Analytical Insight: Deep analysis, market implications
+        - Community Engagement: Conversational, ask questions
+        - Educational Content: Informative, explain concepts
+        - Market Analysis: Price implications, trading insights
+        {articles}
+        
+        Return ONLY a JSON array with one object per article, nothing else:
+        [{{"id": 1, "tweet": "..."}}, {{"id": 2, "tweet": "..."}}]
+        """
+        
+        return batch_prompt
+
     def generate_smart_hashtags(self, news_item):
         """Generate smart, relevant hashtags based on content"""
-        content = (news_item.get('title', '') + ' ' + news_item.get('description', '')).lower()
+        # Reuse the hits NewsManager already found while filtering
+        hits = news_item.keyword_hits
+        if hits is None:
+            hits = self.hashtag_matcher.find_all(news_item.text_lower)
         
         selected_hashtags = ['Crypto']  # Default
         
         # Topic-based hashtag selection
         for topic, tags in HASHTAG_MAPPING.items():
-            if topic in content:
+            if topic in hits:
                 selected_hashtags.extend(tags)
                 break
         
         # Add source-specific hashtag
-        source = news_item.get('source', '').title()
+        source = news_item.source.title()
         if source:
             selected_hashtags.append(source)
         
@@ -1,54 +1,258 @@
 import logging
 import os
+import threading
+import time
+from collections import deque
 from datetime import datetime, timedelta
-from supabase import create_client, Client
-from config import SUPABASE_URL, SUPABASE_KEY
+from .deadline import Deadline
+from .dedup_index import DedupIndex
+from .news_schema import NEWS_SOURCES
+from .post_journal import PostJournal
+from .sqlite_storage import SQLiteStorage
+from .startup_profile import startup_profile
+from .supabase_storage import SupabaseStorage
+from config import (
+    STORAGE_BACKEND, SUPABASE_URL, SUPABASE_KEY, SUPABASE_REPLICA, SQLITE_BACKFILL_RETRY_MAX,
+    STATS_CACHE_TTL, STATS_RESYNC_INTERVAL, CYCLE_GENERATE_RESERVE, CYCLE_POST_RESERVE
+)
 
 class DatabaseManager:
-    def __init__(self):
+    def __init__(self, client=None, storage=None, replica=None):
         self.logger = logging.getLogger(__name__)
-        self.client = self.setup_supabase()
-        
+        self.storage, self.replica = self.setup_storage(client, storage, replica)
+        self.dedup_index = DedupIndex()
+
+        # Writes to a remote store are journaled locally and bulk-inserted in the background:
+        # the Supabase replica behind a local primary, or Supabase itself when it is the primary
+        self.write_behind = self.replica if self.storage.local else self.storage
+        self.journal = PostJournal(self._insert_posted_batch) if self.write_behind else None
+
+        # A fresh local store (e.g. after the host wiped its disk) lacks the history kept in the
+        # replica; until it has been copied in, dedup checks ask the replica as well
+        # (the marker sits next to the database file, so it is wiped along with it)
+        self.history_complete = threading.Event()
+        if self.storage.local and self.replica:
+            self.backfill_marker = self.storage.path + '.backfilled'
+            if os.path.exists(self.backfill_marker):
+                self.history_complete.set()
+        else:
+            self.backfill_marker = None
+            self.history_complete.set()
+
+        # Warm the index off the startup path; lookups fall back to storage until it's ready
+        threading.Thread(target=self.warm_dedup_index, name='dedup-warmup', daemon=True).start()
+
+        # Incremental stats counters, resynced from storage now and then
+        self._stats_counters = None
+        self._stats_cache = None
+        self._stats_cached_at = 0
+        self._stats_lock = threading.Lock()
+        # Resyncs query storage outside _stats_lock; posts recorded meanwhile are kept here
+        self._stats_resync_lock = threading.Lock()
+        self._stats_recorded_during_resync = None
+
+    def setup_storage(self, client=None, storage=None, replica=None):
+        """Pick the primary store and optional Supabase replica from STORAGE_BACKEND"""
+        if storage is not None:
+            return storage, replica
+
+        if STORAGE_BACKEND == 'supabase':
+            return SupabaseStorage(client if client is not None else self.setup_supabase()), None
+
+        with startup_profile.measure('sqlite', 'init'):
+            storage = SQLiteStorage()
+        if replica is None:
+            if client is not None:
+                replica = SupabaseStorage(client)
+            elif SUPABASE_REPLICA and SUPABASE_URL and SUPABASE_KEY:
+                replica = SupabaseStorage(self.setup_supabase())
+        self.logger.info(f"✅ Storage: sqlite{' with Supabase replica' if replica else ''}")
+        return storage, replica
+
     def setup_supabase(self):
         """Initialize Supabase client"""
         try:
             if not SUPABASE_URL or not SUPABASE_KEY:
                 raise ValueError("Supabase URL and Key must be set in environment variables")
-            
+
+            # Imported here so the SDK's import cost is paid on first use, not at app startup
+            with startup_profile.measure('supabase', 'import'):
+                from supabase import create_client
             client = create_client(SUPABASE_URL, SUPABASE_KEY)
-            
-            # Test connection
-            test_response = client.table('posted_news').select('count', count='exact').limit(1).execute()
-            self.logger.info("✅ Supabase connection established successfully")
+
+            # Connectivity is verified by health_check, off the startup path
+            self.logger.info("✅ Supabase client configured")
             return client
-            
+
         except Exception as e:
             self.logger.error(f"❌ Supabase connection failed: {e}")
             raise
 
-    def is_news_posted(self, title):
+    def warm_dedup_index(self, page_size=1000):
+        """Load the persisted dedup index and fold in rows posted since it was saved"""
+        retry_delay = 5
+        backfilled = 0
+        while not self.history_complete.is_set():
+            try:
+                backfilled = self.backfill_from_replica(page_size)
+            except Exception as e:
+                self.logger.error(f"❌ Backfill from Supabase failed, retrying in {retry_delay}s: {e}")
+                time.sleep(retry_delay)
+                retry_delay = min(retry_delay * 2, SQLITE_BACKFILL_RETRY_MAX)
+
+        try:
+            # Backfilled rows carry their original posted_at, which can sit below a saved
+            # watermark, so after a backfill the index is rebuilt from every stored row
+            if not backfilled:
+                self.dedup_index.load()
+            since = self.dedup_index.watermark
+            added = 0
+            offset = 0
+            while True:
+                rows = self.storage.rows_since(since, offset, page_size)
+                for item in rows:
+                    self.dedup_index.warm(item.get('title'), item.get('url'), item.get('posted_at'))
+                added += len(rows)
+                if len(rows) < page_size:
+                    break
+                offset += page_size
+
+            # Posts made while warming are folded in only now, after the history
+            self.dedup_index.mark_ready()
+            self.dedup_index.save()
+            self.logger.info(f"✅ Dedup index warmed ({self.dedup_index.count} entries, {added} new)")
+
+        except Exception as e:
+            # Without a complete index every check falls back to storage
+            self.logger.error(f"❌ Error warming dedup index: {e}")
+
+    def iter_posts_since(self, since, fields=('title', 'url', 'posted_at'), page_size=1000):
+        """Stored rows posted after since, oldest first, fetched a page at a time"""
+        offset = 0
+        while True:
+            rows = self.storage.rows_since(since, offset, page_size, fields=fields)
+            yield from rows
+            if len(rows) < page_size:
+                return
+            offset += page_size
+
+    def backfill_from_replica(self, page_size=1000):
+        """Copy the history kept in Supabase into the local store, then write the completion marker"""
+        copied = 0
+        offset = 0
+        while True:
+            rows = self.replica.rows_since(
+                None, offset, page_size, fields=('title', 'url', 'content', 'source', 'posted_at'))
+            # Rows from an interrupted earlier run or posted since startup are already here
+            stored, _ = self.storage.find_posted([row['title'] for row in rows], [])
+            missing = [row for row in rows if row['title'] not in stored]
+            if missing and not self.storage.insert_posts(missing):
+                raise RuntimeError(f"could not insert {len(missing)} rows into {self.storage.name}")
+            copied += len(missing)
+            if len(rows) < page_size:
+                break
+            offset += page_size
+
+        os.makedirs(os.path.dirname(self.backfill_marker) or '.', exist_ok=True)
+        with open(self.backfill_marker, 'w') as f:
+            f.write(datetime.now().isoformat())
+        self.history_complete.set()
+        self.logger.info(f"📥 Copied {copied} posts from the Supabase replica into local storage")
+        return copied
+
+    def _find_posted(self, titles, urls):
+        """Posted titles and urls, asking the replica too while local history is incomplete"""
+        posted_titles, posted_urls = self.storage.find_posted(titles, urls)
+        if not self.history_complete.is_set():
+            # Errors propagate: without the replica we can't tell what was posted before
+            replica_titles, replica_urls = self.replica.find_posted(titles, urls)
+            posted_titles, posted_urls = posted_titles | replica_titles, posted_urls | replica_urls
+        return posted_titles, posted_urls
+
+    def is_news_posted(self, title, url=None):
         """Check if news has been posted before"""
         try:
-            response = self.client.table('posted_news')\
-                .select('id')\
-                .eq('title', title)\
-                .execute()
-            
-            exists = len(response.data) > 0
-            
+            if self.dedup_index.ready and not self.dedup_index.might_contain(title, url):
+                self.logger.debug(f"🆕 New news found: {title[:50]}...")
+                return False
+
+            # Journaled posts may not have reached the primary yet
+            journaled_titles, journaled_urls = self._journaled_keys()
+            if title in journaled_titles or (url and url in journaled_urls):
+                return True
+
+            # Possible hit (or no index yet): confirm against storage
+            exists = self.storage.is_posted(title, url)
+            if not exists and not self.history_complete.is_set():
+                exists = self.replica.is_posted(title, url)
+
             if exists:
                 self.logger.debug(f"📌 News already in database: {title[:50]}...")
             else:
                 self.logger.debug(f"🆕 New news found: {title[:50]}...")
-                
+
             return exists
-            
+
         except Exception as e:
-            self.logger.error(f"❌ Error checking news in Supabase: {e}")
-            return False
+            self.logger.error(f"❌ Error checking news in {self.storage.name}: {e}")
+            # With history still missing, an unanswered check must not let a repost through
+            return not self.history_complete.is_set()
+
+    def filter_unposted(self, news_items, budget=None):
+        """Return the items that haven't been posted, using one query for all possible hits"""
+        if not news_items:
+            return []
+        budget = budget or Deadline.unbounded()
+        try:
+            if self.dedup_index.ready:
+                possible = [item for item in news_items
+                            if self.dedup_index.might_contain(item.title, item.url)]
+            else:
+                possible = list(news_items)
+
+            if not possible:
+                return list(news_items)
+
+            # Drop journaled posts first; they may not have reached the primary yet
+            journaled_titles, journaled_urls = self._journaled_keys()
+            if journaled_titles:
+                news_items = [item for item in news_items
+                              if item.title not in journaled_titles and item.url not in journaled_urls]
+                possible = [item for item in possible
+                            if item.title not in journaled_titles and item.url not in journaled_urls]
+                if not possible:
+                    return news_items
+
+            if (not self.storage.local and self.dedup_index.ready
+                    and not budget.has(CYCLE_GENERATE_RESERVE + CYCLE_POST_RESERVE)):
+                # No time for a remote round trip: treat every filter hit as posted, which can
+                # only skip a fresh item, never repost one
+                possible_ids = {id(item) for item in possible}
+                unposted = [item for item in news_items if id(item) not in possible_ids]
+                self.logger.info(f"⏱️ Skipped {self.storage.name} dedup check, "
+                                 f"{len(unposted)} of {len(news_items)} candidates pass the filter")
+                return unposted
+
+            posted_titles, posted_urls = self._find_posted(
+                [item.title for item in possible],
+                [item.url for item in possible if item.url]
+            )
+            unposted = [
+                item for item in news_items
+                if item.title not in posted_titles and item.url not in posted_urls
+            ]
+            self.logger.info(f"🔎 {len(unposted)} of {len(news_items)} candidates are unposted")
+            return unposted
+
+        except Exception as e:
+            self.logger.error(f"❌ Error batch-checking news in {self.storage.name}: {e}")
+            if not self.history_complete.is_set():
+                # Local history is incomplete and the replica didn't answer: post nothing this cycle
+                return []
+            return list(news_items)
 
     def mark_news_as_posted(self, title, url, content, source):
-        """Mark news as posted in Supabase"""
+        """Mark news as posted; remote writes are journaled and flushed in the background"""
         try:
             data = {
                 'title': title,
@@ -57,89 +261,165 @@ class DatabaseManager:
                 'source': source,
                 'posted_at': datetime.now().isoformat()
             }
-            
-            response = self.client.table('posted_news').insert(data).execute()
-            
-            if response.data:
-                self.logger.info(f"✅ News marked as posted in Supabase: {title[:50]}...")
-                return True
-            else:
-                self.logger.error(f"❌ Failed to insert news into Supabase: {response.error}")
-                return False
-                
+
+            if self.storage.local:
+                self.storage.insert_posts([data])
+            if self.journal:
+                self.journal.append(data)
+            self.dedup_index.add(title, url, data['posted_at'])
+            if self.dedup_index.ready:
+                self.dedup_index.save()
+            self._record_post_in_stats(source, data['posted_at'])
+            self.logger.info(f"✅ News marked as posted: {title[:50]}...")
+            return True
+
         except Exception as e:
-            self.logger.error(f"❌ Error marking news in Supabase: {e}")
+            self.logger.error(f"❌ Error marking news as posted: {e}")
             return False
 
+    def _insert_posted_batch(self, records, replayed=False):
+        """Bulk insert journaled rows into the write-behind store"""
+        if replayed:
+            # A crash between insert and journal rewrite leaves rows that are already stored
+            stored, _ = self.write_behind.find_posted([record['title'] for record in records], [])
+            records = [record for record in records if record['title'] not in stored]
+            if not records:
+                return True
+
+        if self.write_behind.insert_posts(records):
+            self.logger.info(f"✅ Flushed {len(records)} posts to {self.write_behind.name}")
+            return True
+        return False
+
+    def _journaled_keys(self):
+        """Titles and urls of posts the primary store doesn't have yet"""
+        if not self.journal or self.write_behind is not self.storage:
+            return set(), set()
+        records = self.journal.pending_records()
+        return {record['title'] for record in records}, {record['url'] for record in records if record.get('url')}
+
     def get_bot_stats(self):
-        """Get comprehensive bot statistics from Supabase"""
+        """Get comprehensive bot statistics, served from incremental counters"""
         try:
-            # Total posts count
-            total_response = self.client.table('posted_news')\
-                .select('id', count='exact')\
-                .execute()
-            total_posts = total_response.count
-
-            # Today's posts count
-            today_start = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
-            today_response = self.client.table('posted_news')\
-                .select('id', count='exact')\
-                .gte('posted_at', today_start.isoformat())\
-                .execute()
-            today_posts = today_response.count
-
-            # Last 24 hours posts count
-            last_24h = datetime.now() - timedelta(hours=24)
-            last_24h_response = self.client.table('posted_news')\
-                .select('id', count='exact')\
-                .gte('posted_at', last_24h.isoformat())\
-                .execute()
-            last_24h_posts = last_24h_response.count
-
-            # Source distribution
-            source_response = self.client.table('posted_news')\
-                .select('source')\
-                .execute()
-            
-            source_stats = {}
-            for item in source_response.data:
-                source = item['source']
-                source_stats[source] = source_stats.get(source, 0) + 1
-
-            # Success rate calculation (based on 5-minute intervals)
-            success_rate = (last_24h_posts / 24) * 100 if last_24h_posts > 0 else 0
+            with self._stats_lock:
+                now = time.monotonic()
+                if self._stats_cache and now - self._stats_cached_at < STATS_CACHE_TTL:
+                    return dict(self._stats_cache)
+
+            if self._stats_resync_due():
+                self._resync_stats_counters()
+
+            with self._stats_lock:
+                counters = self._stats_counters
+                current_time = datetime.now()
+                last_24h = current_time - timedelta(hours=24)
+                today_start = current_time.replace(hour=0, minute=0, second=0, microsecond=0)
+
+                recent = counters['recent']
+                while recent and recent[0] < last_24h:
+                    recent.popleft()
+                last_24h_posts = len(recent)
+                today_posts = sum(1 for posted_at in recent if posted_at >= today_start)
+
+                # Success rate calculation (based on 5-minute intervals)
+                success_rate = (last_24h_posts / 24) * 100 if last_24h_posts > 0 else 0
+
+                self._stats_cache = {
+                    'total_posts': counters['total'],
+                    'today_posts': today_posts,
+                    'last_24h_posts': last_24h_posts,
+                    'success_rate': min(success_rate, 100),
+                    'source_stats': dict(counters['source_stats']),
+                    'database': self.storage.name
+                }
+                self._stats_cached_at = now
+                return dict(self._stats_cache)
 
-            return {
-                'total_posts': total_posts,
-                'today_posts': today_posts,
-                'last_24h_posts': last_24h_posts,
-                'success_rate': min(success_rate, 100),
-                'source_stats': source_stats,
-                'database': 'supabase'
-            }
-            
         except Exception as e:
-            self.logger.error(f"❌ Error getting bot stats from Supabase: {e}")
+            self.logger.error(f"❌ Error getting bot stats from {self.storage.name}: {e}")
             return {
-                'total_posts': 0, 
-                'today_posts': 0, 
+                'total_posts': 0,
+                'today_posts': 0,
                 'last_24h_posts': 0,
                 'success_rate': 0,
                 'source_stats': {},
                 'database': 'error'
             }
 
+    def _stats_resync_due(self):
+        with self._stats_lock:
+            counters = self._stats_counters
+            return counters is None or time.monotonic() - counters['synced_at'] >= STATS_RESYNC_INTERVAL
+
+    def _resync_stats_counters(self):
+        """Reload the counters without holding _stats_lock across the storage queries"""
+        with self._stats_resync_lock:
+            if not self._stats_resync_due():
+                return  # another caller resynced while we waited
+            with self._stats_lock:
+                self._stats_recorded_during_resync = []
+            try:
+                counters, seen = self._load_stats_counters()
+            except Exception:
+                with self._stats_lock:
+                    self._stats_recorded_during_resync = None
+                raise
+
+            with self._stats_lock:
+                # Posts made while the queries ran count unless the snapshot already saw them
+                for source, posted_at in self._stats_recorded_during_resync:
+                    if self._parse_timestamp(posted_at) not in seen:
+                        self._add_post_to_counters(counters, source, posted_at)
+                self._stats_recorded_during_resync = None
+                self._stats_counters = counters
+                self._stats_cache = None
+
+    def _load_stats_counters(self):
+        """Rebuild stats counters from storage-side aggregates instead of scanning the table"""
+        last_24h = datetime.now() - timedelta(hours=24)
+        snapshot = self.storage.stats_snapshot(NEWS_SOURCES + ['unknown'], last_24h.isoformat())
+        recent = deque(sorted(self._parse_timestamp(posted_at) for posted_at in snapshot['recent']))
+
+        self.logger.info(f"📊 Stats counters synced from {self.storage.name}")
+        return {
+            'total': snapshot['total'],
+            'source_stats': snapshot['source_stats'],
+            'recent': recent,
+            'synced_at': time.monotonic()
+        }, set(recent)
+
+    def _record_post_in_stats(self, source, posted_at):
+        """Fold a new post into the stats counters"""
+        with self._stats_lock:
+            if self._stats_counters is not None:
+                self._add_post_to_counters(self._stats_counters, source, posted_at)
+            if self._stats_recorded_during_resync is not None:
+                self._stats_recorded_during_resync.append((source, posted_at))
+            self._stats_cache = None
+
+    def _add_post_to_counters(self, counters, source, posted_at):
+        counters['total'] += 1
+        counters['source_stats'][source] = counters['source_stats'].get(source, 0) + 1
+        counters['recent'].append(self._parse_timestamp(posted_at))
+
+    @staticmethod
+    def _parse_timestamp(value):
+        """Parse a posted_at value into a naive local datetime"""
+        parsed = datetime.fromisoformat(value)
+        if parsed.tzinfo is not None:
+            parsed = parsed.astimezone().replace(tzinfo=None)
+        return parsed
+
     def get_recent_posts(self, limit=10):
-        """Get recent posts from Supabase"""
+        """Get recent posts from storage"""
         try:
-            response = self.client.table('posted_news')\
-                .select('*')\
-                .order('posted_at', desc=True)\
-                .limit(limit)\
-                .execute()
-            
+            rows = self.storage.recent_posts(limit)
+
+            # Newest first, including posts the primary doesn't have yet
+            if self.journal and self.write_behind is self.storage:
+                rows = self.journal.pending_records()[::-1] + rows
             posts = []
-            for item in response.data:
+            for item in rows[:limit]:
                 posts.append({
                     'title': item.get('title'),
                     'source': item.get('source'),
@@ -147,49 +427,46 @@ class DatabaseManager:
                     'content': item.get('content'),
                     'url': item.get('url')
                 })
-            
+
             return posts
-            
+
         except Exception as e:
-            self.logger.error(f"❌ Error getting recent posts from Supabase: {e}")
+            self.logger.error(f"❌ Error getting recent posts from {self.storage.name}: {e}")
             return []
 
     def cleanup_old_records(self, days=30):
-        """Cleanup old records from Supabase"""
+        """Cleanup old records from storage and its replica"""
         try:
             cutoff_date = datetime.now() - timedelta(days=days)
-            
-            response = self.client.table('posted_news')\
-                .delete()\
-                .lt('posted_at', cutoff_date.isoformat())\
-                .execute()
-            
-            deleted_count = len(response.data) if response.data else 0
-            self.logger.info(f"🧹 Cleaned up {deleted_count} records older than {days} days from Supabase")
-            
+
+            deleted_count = self.storage.delete_older_than(cutoff_date.isoformat())
+            if self.replica:
+                try:
+                    self.replica.delete_older_than(cutoff_date.isoformat())
+                except Exception as e:
+                    self.logger.warning(f"⚠️ Replica cleanup failed: {e}")
+            self.logger.info(f"🧹 Cleaned up {deleted_count} records older than {days} days from {self.storage.name}")
+
             return deleted_count
-            
+
         except Exception as e:
-            self.logger.error(f"❌ Error cleaning up old records in Supabase: {e}")
+            self.logger.error(f"❌ Error cleaning up old records in {self.storage.name}: {e}")
             return 0
 
     def health_check(self):
-        """Check Supabase connection health"""
+        """Check storage connection health"""
         try:
-            response = self.client.table('posted_news')\
-                .select('id')\
-                .limit(1)\
-                .execute()
-            
+            self.storage.ping()
+
             return {
                 'status': 'healthy',
-                'database': 'supabase',
+                'database': self.storage.name,
                 'table_access': True
             }
-            
+
         except Exception as e:
             return {
                 'status': 'unhealthy',
-                'database': 'supabase', 
+                'database': self.storage.name,
                 'error': str(e)
             }
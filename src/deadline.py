@@ -0,0 +1,37 @@
+import time
+
+class Deadline:
+    """Time budget for one cycle, shared by every stage and call inside it"""
+
+    __slots__ = ('budget', 'started', 'expires_at')
+
+    def __init__(self, seconds):
+        self.budget = seconds
+        self.started = time.monotonic()
+        self.expires_at = self.started + seconds
+
+    @classmethod
+    def unbounded(cls):
+        """A deadline that never runs out, for callers outside a cycle"""
+        return cls(float('inf'))
+
+    def remaining(self):
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def elapsed(self):
+        return time.monotonic() - self.started
+
+    def expired(self):
+        return time.monotonic() >= self.expires_at
+
+    def has(self, seconds):
+        """Whether at least this much time is left, e.g. before optional work"""
+        return self.remaining() >= seconds
+
+    def timeout(self, cap, reserve=0.0, floor=0.0):
+        """Time left after reserving some for later stages, capped; floor wins over the reserve"""
+        remaining = self.remaining()
+        return max(min(floor, remaining), min(cap, remaining - reserve))
+
+    def __repr__(self):
+        return f'Deadline(remaining={self.remaining():.2f}s of {self.budget}s)'
@@ -0,0 +1,148 @@
+import hashlib
+import json
+import logging
+import math
+import os
+import re
+import threading
+from config import DEDUP_INDEX_PATH, DEDUP_INDEX_CAPACITY, DEDUP_INDEX_ERROR_RATE
+
+_NON_WORD = re.compile(r'[^a-z0-9]+')
+
+def normalize_text(text):
+    """Lowercase and collapse punctuation/whitespace so trivial edits hash the same"""
+    return _NON_WORD.sub(' ', (text or '').lower()).strip()
+
+class BloomFilter:
+    """Fixed-size Bloom filter using double hashing over a blake2b digest"""
+
+    def __init__(self, capacity, error_rate, bits=None, num_hashes=None):
+        self.size = max(int(-capacity * math.log(error_rate) / (math.log(2) ** 2)), 8)
+        self.num_hashes = num_hashes or max(int(round(self.size / capacity * math.log(2))), 1)
+        self.bits = bits if bits is not None else bytearray((self.size + 7) // 8)
+
+    def _positions(self, key):
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self.size for i in range(self.num_hashes)]
+
+    def add(self, key):
+        for pos in self._positions(key):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, key):
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+class DedupIndex:
+    """In-process index of posted news keyed by normalized title and URL"""
+
+    def __init__(self, path=DEDUP_INDEX_PATH, capacity=DEDUP_INDEX_CAPACITY, error_rate=DEDUP_INDEX_ERROR_RATE):
+        self.logger = logging.getLogger(__name__)
+        self.path = path
+        self.capacity = capacity
+        self.error_rate = error_rate
+
+        self.bloom = BloomFilter(capacity, error_rate)
+        self.count = 0
+        self.watermark = None  # latest posted_at folded into the index
+        self.ready = False
+        self.pending = []  # posts recorded before warming finished, folded in by mark_ready
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def keys_for(title, url=None):
+        """Index keys for a news item"""
+        keys = ['t:' + normalize_text(title)]
+        if url:
+            keys.append('u:' + url.strip().lower())
+        return keys
+
+    def add(self, title, url=None, posted_at=None):
+        """Record a posted news item"""
+        with self._lock:
+            if not self.ready:
+                # Moving the watermark now would let a save skip the history not loaded yet
+                self.pending.append((title, url, posted_at))
+                return
+            self._add(title, url, posted_at)
+
+    def warm(self, title, url=None, posted_at=None):
+        """Fold in a stored row while the index is being built"""
+        with self._lock:
+            self._add(title, url, posted_at)
+
+    def mark_ready(self):
+        """Finish warming: fold in posts recorded meanwhile and start answering lookups"""
+        with self._lock:
+            for title, url, posted_at in self.pending:
+                self._add(title, url, posted_at)
+            self.pending = []
+            self.ready = True
+
+    def _add(self, title, url, posted_at):
+        # Caller holds the lock
+        for key in self.keys_for(title, url):
+            self.bloom.add(key)
+        self.count += 1
+        if posted_at and (self.watermark is None or posted_at > self.watermark):
+            self.watermark = posted_at
+
+    def might_contain(self, title, url=None):
+        """False means definitely not posted; True means possibly posted"""
+        with self._lock:
+            return any(key in self.bloom for key in self.keys_for(title, url))
+
+    def load(self):
+        """Load a persisted index before warming; returns False when missing or incompatible"""
+        if self.ready or self.count:
+            self.logger.warning("⚠️ Not loading the dedup index over one that is already filled")
+            return False
+        if not self.path or not os.path.exists(self.path):
+            return False
+        try:
+            with open(self.path, 'rb') as f:
+                header = json.loads(f.readline().decode('utf-8'))
+                bits = bytearray(f.read())
+
+            bloom = BloomFilter(self.capacity, self.error_rate, bits=bits, num_hashes=header['num_hashes'])
+            if header.get('version') != 1 or header['size'] != bloom.size or len(bits) != len(bloom.bits):
+                self.logger.warning("⚠️ Dedup index on disk doesn't match current settings, rebuilding")
+                return False
+
+            with self._lock:
+                self.bloom = bloom
+                self.count = header.get('count', 0)
+                self.watermark = header.get('watermark')
+            self.logger.info(f"📂 Loaded dedup index with {self.count} entries")
+            return True
+        except Exception as e:
+            self.logger.error(f"❌ Error loading dedup index: {e}")
+            return False
+
+    def save(self):
+        """Atomically persist the index so the next cold start skips the full table scan"""
+        if not self.path or not self.ready:
+            # A partly warmed index with a fresh watermark would hide older history on reload
+            return False
+        try:
+            with self._lock:
+                header = {
+                    'version': 1,
+                    'size': self.bloom.size,
+                    'num_hashes': self.bloom.num_hashes,
+                    'count': self.count,
+                    'watermark': self.watermark
+                }
+                bits = bytes(self.bloom.bits)
+
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            tmp_path = self.path + '.tmp'
+            with open(tmp_path, 'wb') as f:
+                f.write(json.dumps(header).encode('utf-8') + b'\n')
+                f.write(bits)
+            os.replace(tmp_path, self.path)
+            return True
+        except Exception as e:
+            self.logger.error(f"❌ Error saving dedup index: {e}")
+            return False
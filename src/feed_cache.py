@@ -0,0 +1,91 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from config import FEED_CACHE_TTL, FEED_CACHE_STALE_GRACE, FEED_CACHE_MAX_ENTRIES
+
+class FeedCache:
+    """Bounded TTL cache for parsed news feeds with stale-while-revalidate"""
+
+    def __init__(self, ttl=FEED_CACHE_TTL, stale_grace=FEED_CACHE_STALE_GRACE, max_entries=FEED_CACHE_MAX_ENTRIES):
+        self.logger = logging.getLogger(__name__)
+        self.ttl = ttl
+        self.stale_grace = stale_grace
+        self.max_entries = max_entries
+
+        self.entries = OrderedDict()
+        self.refreshing = set()
+        self.stats = {'hits': 0, 'stale_hits': 0, 'misses': 0, 'refresh_errors': 0}
+        self._lock = threading.Lock()
+
+    def get(self, key, loader, refresher=None):
+        """Return cached items for key, loading through loader; background refreshes use refresher if given"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry:
+                self.entries.move_to_end(key)
+                age = now - entry['fetched_at']
+                if age < self.ttl:
+                    self.stats['hits'] += 1
+                    return list(entry['items'])
+                if age < self.ttl + self.stale_grace:
+                    # Serve stale immediately and refresh in the background
+                    self.stats['stale_hits'] += 1
+                    self._start_refresh(key, refresher or loader)
+                    return list(entry['items'])
+            self.stats['misses'] += 1
+
+        items = loader()
+        if items:
+            self.put(key, items)
+        return items
+
+    def put(self, key, items):
+        """Store freshly loaded items for key"""
+        with self._lock:
+            self.entries[key] = {'items': list(items), 'fetched_at': time.monotonic()}
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def invalidate(self, key=None):
+        """Drop one key, or everything when key is None"""
+        with self._lock:
+            if key is None:
+                self.entries.clear()
+            else:
+                self.entries.pop(key, None)
+
+    def get_stats(self):
+        """Cache hit/miss counters"""
+        with self._lock:
+            stats = dict(self.stats)
+            stats['entries'] = len(self.entries)
+        return stats
+
+    def _start_refresh(self, key, loader):
+        """Kick off a single background refresh per key (caller holds the lock)"""
+        if key in self.refreshing:
+            return
+        self.refreshing.add(key)
+        threading.Thread(target=self._refresh, args=(key, loader), name=f'feed-refresh-{key}', daemon=True).start()
+
+    def _refresh(self, key, loader):
+        """Reload key; on failure the stale entry stays until its grace window ends"""
+        try:
+            items = loader()
+            if items:
+                self.put(key, items)
+                self.logger.debug(f"🔄 Refreshed cached feed: {key}")
+            else:
+                with self._lock:
+                    self.stats['refresh_errors'] += 1
+                self.logger.warning(f"⚠️ Background refresh for {key} failed, serving stale data")
+        except Exception as e:
+            with self._lock:
+                self.stats['refresh_errors'] += 1
+            self.logger.error(f"❌ Background refresh for {key} raised: {e}")
+        finally:
+            with self._lock:
+                self.refreshing.discard(key)
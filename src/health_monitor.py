@@ -0,0 +1,89 @@
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import datetime
+from config import HEALTH_CHECK_INTERVAL, HEALTH_FRESH_TIMEOUT, HEALTH_STARTUP_DELAY
+
+class HealthMonitor:
+    """Runs dependency checks concurrently in the background and keeps the latest snapshot"""
+
+    def __init__(self, bot, interval=HEALTH_CHECK_INTERVAL, fresh_timeout=HEALTH_FRESH_TIMEOUT):
+        self.logger = logging.getLogger(__name__)
+        self.interval = interval
+        self.fresh_timeout = fresh_timeout
+
+        # Looked up on each run so components can be swapped or built lazily; each check pairs
+        # the call with how to tell a healthy value, since some report failure in the value itself
+        self.checks = {
+            'twitter': (lambda: bot.twitter.verify_credentials(), bool),
+            'database': (lambda: bot.db.health_check(), lambda value: value.get('status') == 'healthy'),
+            'stats': (lambda: bot.db.get_bot_stats(), lambda value: value.get('database') != 'error')
+        }
+        self.results = {
+            name: {'ok': None, 'value': None, 'error': None, 'checked_at': None, 'duration_ms': None}
+            for name in self.checks
+        }
+
+        self.executor = ThreadPoolExecutor(max_workers=len(self.checks), thread_name_prefix='health-check')
+        self.inflight = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self, initial_delay=HEALTH_STARTUP_DELAY):
+        """Refresh the snapshot on a background cadence, starting after initial_delay"""
+        if self._thread:
+            return
+        self._thread = threading.Thread(target=self._loop, args=(initial_delay,), name='health-monitor', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _loop(self, initial_delay):
+        # Let the app bind its port before checks build clients and import SDKs
+        if self._stop.wait(initial_delay):
+            return
+        while not self._stop.is_set():
+            self.refresh(timeout=self.interval)
+            self._stop.wait(self.interval)
+
+    def refresh(self, timeout=None):
+        """Run all checks concurrently, waiting at most timeout seconds for them"""
+        with self._lock:
+            futures = []
+            for name, check in self.checks.items():
+                future = self.inflight.get(name)
+                if future is None or future.done():
+                    # A check still running from an earlier refresh is awaited rather than duplicated
+                    future = self.executor.submit(self._run_check, name, check)
+                    self.inflight[name] = future
+                futures.append(future)
+
+        done, pending = wait(futures, timeout=timeout)
+        if pending:
+            self.logger.warning(f"⏰ {len(pending)} health checks still running after {timeout}s")
+        return self.get_snapshot()
+
+    def _run_check(self, name, check):
+        check, is_ok = check
+        started = time.perf_counter()
+        try:
+            value = check()
+            result = {'ok': bool(value) and is_ok(value), 'value': value, 'error': None}
+        except Exception as e:
+            self.logger.error(f"❌ Health check {name} failed: {e}")
+            result = {'ok': False, 'value': None, 'error': str(e)}
+
+        result['checked_at'] = datetime.now().isoformat()
+        result['duration_ms'] = round((time.perf_counter() - started) * 1000, 1)
+        with self._lock:
+            self.results[name] = result
+
+    def get_snapshot(self, fresh=False):
+        """Latest results for every check; fresh=True forces a bounded-time refresh first"""
+        if fresh:
+            self.refresh(timeout=self.fresh_timeout)
+        with self._lock:
+            return {name: dict(result) for name, result in self.results.items()}
@@ -0,0 +1,62 @@
+import re
+
+# What may follow a keyword for it to count: an optional plural ending, then a word boundary
+_WORD_END = re.compile(r'(?:e?s)?\b')
+
+class KeywordMatcher:
+    """Finds every keyword in a text with one precompiled, trie-shaped regex"""
+
+    def __init__(self, keywords):
+        self.keywords = frozenset(k.lower().strip() for k in keywords if k and k.strip())
+        # Keywords with a shorter keyword as a prefix; their hits may hide that shorter one
+        self.nested = frozenset(
+            keyword for keyword in self.keywords
+            if any(keyword[:i] in self.keywords for i in range(1, len(keyword)))
+        )
+        self.trie = {}
+        if self.keywords:
+            trie = self.trie
+            for keyword in self.keywords:
+                node = trie
+                for ch in keyword:
+                    node = node.setdefault(ch, {})
+                node[''] = {}
+            # Lookahead so overlapping keywords starting at different words are all reported;
+            # a trailing plural "s"/"es" still counts as a hit for the singular keyword
+            self.regex = re.compile(r'\b(?=(' + self._trie_pattern(trie) + r')(?:e?s)?\b)')
+        else:
+            self.regex = None
+
+    @classmethod
+    def _trie_pattern(cls, node):
+        """Turn a character trie into a regex without redundant alternation"""
+        alternatives = [re.escape(ch) + cls._trie_pattern(child) for ch, child in sorted(node.items()) if ch]
+        optional = '' in node
+        if not alternatives:
+            return ''
+        if len(alternatives) == 1 and not optional:
+            return alternatives[0]
+        pattern = '(?:' + '|'.join(alternatives) + ')'
+        return pattern + '?' if optional else pattern
+
+    def find_all(self, text):
+        """Return the set of keywords present in text"""
+        if not self.regex or not text:
+            return set()
+        text = text.lower()
+        hits = set()
+        for match in self.regex.finditer(text):
+            keyword = match.group(1)
+            hits.add(keyword)
+            if keyword in self.nested:
+                # The lookahead reports the longest keyword per start; shorter ones there count too
+                hits.update(self._prefix_hits(text, match.start(), keyword))
+        return hits
+
+    def _prefix_hits(self, text, start, keyword):
+        """Shorter keywords that are prefixes of keyword and also end a word at start"""
+        node = self.trie
+        for i, ch in enumerate(keyword[:-1], 1):
+            node = node[ch]
+            if '' in node and _WORD_END.match(text, start + i):
+                yield keyword[:i]
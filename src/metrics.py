@@ -0,0 +1,138 @@
+import threading
+import time
+from contextlib import contextmanager
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{key}="{_escape(value)}"' for key, value in labels) + '}'
+
+class Counter:
+    """Monotonic counter with labels"""
+
+    def __init__(self, name, documentation):
+        self.name = name
+        self.documentation = documentation
+        self.values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} counter']
+        with self._lock:
+            for labels, value in sorted(self.values.items()):
+                lines.append(f'{self.name}{_format_labels(labels)} {value}')
+        return lines
+
+class Histogram:
+    """Cumulative-bucket histogram with labels"""
+
+    def __init__(self, name, documentation, buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = tuple(buckets)
+        self.values = {}  # labels -> [bucket counts..., sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self.values.get(key)
+            if series is None:
+                series = self.values[key] = [0] * len(self.buckets) + [0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} histogram']
+        with self._lock:
+            for labels, series in sorted(self.values.items()):
+                for bound, count in zip(self.buckets, series):
+                    lines.append(f'{self.name}_bucket{_format_labels(labels + (("le", bound),))} {count}')
+                lines.append(f'{self.name}_bucket{_format_labels(labels + (("le", "+Inf"),))} {series[-1]}')
+                lines.append(f'{self.name}_sum{_format_labels(labels)} {series[-2]}')
+                lines.append(f'{self.name}_count{_format_labels(labels)} {series[-1]}')
+        return lines
+
+class MetricsRegistry:
+    """Holds metrics and renders them in the Prometheus text exposition format"""
+
+    def __init__(self):
+        self.metrics = []
+
+    def counter(self, name, documentation):
+        metric = Counter(name, documentation)
+        self.metrics.append(metric)
+        return metric
+
+    def histogram(self, name, documentation, buckets=LATENCY_BUCKETS):
+        metric = Histogram(name, documentation, buckets)
+        self.metrics.append(metric)
+        return metric
+
+    def render(self):
+        lines = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+registry = MetricsRegistry()
+
+CYCLE_DURATION = registry.histogram('bot_cycle_duration_seconds', 'Duration of a full bot cycle')
+CYCLE_TOTAL = registry.counter('bot_cycles_total', 'Bot cycles by outcome')
+STAGE_DURATION = registry.histogram('bot_stage_duration_seconds', 'Duration of each bot cycle stage')
+STAGE_TOTAL = registry.counter('bot_stage_total', 'Bot cycle stages by outcome')
+CALL_DURATION = registry.histogram('bot_external_call_duration_seconds', 'Latency of calls to external services')
+CALL_TOTAL = registry.counter('bot_external_call_total', 'Calls to external services by outcome')
+CALL_PAYLOAD = registry.histogram('bot_external_call_payload_bytes', 'Payload size of external calls', SIZE_BUCKETS)
+SOURCE_BREAKER_TOTAL = registry.counter('bot_source_breaker_transitions_total', 'News source circuit breaker state changes')
+
+class _Tracker:
+    __slots__ = ('outcome', 'payload_bytes')
+
+    def __init__(self):
+        self.outcome = 'ok'
+        self.payload_bytes = None
+
+@contextmanager
+def track_call(service, operation):
+    """Time an external call; callers may set .outcome and .payload_bytes on the tracker"""
+    tracker = _Tracker()
+    started = time.perf_counter()
+    try:
+        yield tracker
+    except BaseException:
+        tracker.outcome = 'error'
+        raise
+    finally:
+        CALL_DURATION.observe(time.perf_counter() - started, service=service, operation=operation)
+        CALL_TOTAL.inc(service=service, operation=operation, outcome=tracker.outcome)
+        if tracker.payload_bytes is not None:
+            CALL_PAYLOAD.observe(tracker.payload_bytes, service=service, operation=operation)
+
+@contextmanager
+def track_stage(stage):
+    """Time a bot cycle stage; callers may set .outcome on the tracker"""
+    tracker = _Tracker()
+    started = time.perf_counter()
+    try:
+        yield tracker
+    except BaseException:
+        tracker.outcome = 'error'
+        raise
+    finally:
+        STAGE_DURATION.observe(time.perf_counter() - started, stage=stage)
+        STAGE_TOTAL.inc(stage=stage, outcome=tracker.outcome)
@@ -0,0 +1,82 @@
+import sys
+from array import array
+
+class NewsItem:
+    """A news article, normalized once when it enters the pipeline"""
+
+    __slots__ = (
+        'title', 'description', 'url', 'published_at', 'author', 'source',
+        'text_lower', 'quality_score', 'keyword_hits', 'similarity_signature'
+    )
+
+    def __init__(self, title, description, url='', published_at='', author='', source='unknown'):
+        self.title = (title or '').strip()
+        self.description = (description or '').strip()
+        self.url = url or ''
+        self.published_at = published_at or ''
+        self.author = author or ''
+        # A handful of source names shared by every item
+        self.source = sys.intern(source or 'unknown')
+        self.text_lower = f'{self.title} {self.description}'.lower()
+        self.quality_score = 0.0
+        self.keyword_hits = None
+        self.similarity_signature = None
+
+    @property
+    def text(self):
+        """Title and description as one string"""
+        return f'{self.title} {self.description}'
+
+    def to_dict(self):
+        """Plain dict for JSON responses and storage"""
+        return {
+            'title': self.title,
+            'description': self.description,
+            'url': self.url,
+            'published_at': self.published_at,
+            'author': self.author,
+            'source': self.source,
+            'quality_score': self.quality_score
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """Build an item from a dict with the to_dict() keys"""
+        item = cls(
+            title=data.get('title'),
+            description=data.get('description'),
+            url=data.get('url'),
+            published_at=data.get('published_at'),
+            author=data.get('author'),
+            source=data.get('source')
+        )
+        item.quality_score = data.get('quality_score', 0.0)
+        return item
+
+    def __repr__(self):
+        return f'NewsItem(source={self.source!r}, title={self.title[:40]!r}, score={self.quality_score})'
+
+class NewsBatch:
+    """Items plus a parallel array of scores, for scoring and ranking many items at once"""
+
+    __slots__ = ('items', 'scores')
+
+    def __init__(self, items):
+        self.items = list(items)
+        self.scores = array('d', bytes(8 * len(self.items)))
+
+    def __len__(self):
+        return len(self.items)
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def ranked(self):
+        """Items ordered by score, best first, with quality_score filled in"""
+        order = sorted(range(len(self.items)), key=self.scores.__getitem__, reverse=True)
+        ranked = []
+        for index in order:
+            item = self.items[index]
+            item.quality_score = self.scores[index]
+            ranked.append(item)
+        return ranked
@@ -1,6 +1,10 @@
 import logging
 import re
-from config import MIN_NEWS_LENGTH
+from datetime import datetime
+from .keyword_matcher import KeywordMatcher
+from .news_item import NewsBatch
+from .similarity_index import SimilarityIndex
+from config import HASHTAG_MAPPING, MIN_NEWS_LENGTH, SIMILARITY_THRESHOLD, SIMILARITY_WINDOW_DAYS
 
 class NewsManager:
     def __init__(self):
@@ -32,23 +36,46 @@ class NewsManager:
             'investment opportunity', 'free money'
         ]
 
+        # One matcher for scoring, spam and hashtag topics: a single pass per item
+        self.spam_set = frozenset(self.spam_keywords)
+        self.matcher = KeywordMatcher(
+            list(self.important_keywords) + self.spam_keywords + list(HASHTAG_MAPPING)
+        )
+
+        # Near-duplicate detection across sources, persisted locally
+        self.similarity_index = SimilarityIndex()
+        # Without a log (fresh data dir or a new signature format) the index is seeded from post history
+        self.needs_similarity_seed = not self.similarity_index.load()
+        if self.similarity_index.prune(SIMILARITY_WINDOW_DAYS):
+            self.similarity_index.compact()
+
     def filter_news(self, news_items):
-        """Filter and score news items"""
-        filtered_items = []
+        """Filter and score news items, returning them best first"""
+        valid_items = []
         
         for item in news_items:
-            if self.is_valid_news(item):
-                # Calculate quality score
-                item['quality_score'] = self.calculate_quality_score(item)
-                filtered_items.append(item)
+            hits = self.match_keywords(item)
+            if self.is_valid_news(item, hits):
+                item.keyword_hits = hits
+                valid_items.append(item)
+
+        # Calculate quality scores into the batch's score array
+        batch = NewsBatch(valid_items)
+        for index, item in enumerate(batch.items):
+            batch.scores[index] = self.calculate_quality_score(item, item.keyword_hits)
+        filtered_items = batch.ranked()
         
         self.logger.info(f"✅ Filtered {len(filtered_items)} valid news from {len(news_items)} items")
         return filtered_items
 
-    def is_valid_news(self, news_item):
+    def match_keywords(self, news_item):
+        """All keyword hits in the item's title and description"""
+        return self.matcher.find_all(news_item.text_lower)
+
+    def is_valid_news(self, news_item, hits=None):
         """Validate news item"""
-        title = news_item.get('title', '').strip()
-        description = news_item.get('description', '').strip()
+        title = news_item.title
+        description = news_item.description
         
         # Basic validation
         if not title or len(title) < 10:
@@ -56,40 +83,41 @@ class NewsManager:
         
         if not description or len(description) < MIN_NEWS_LENGTH:
             return False
+
+        if hits is None:
+            hits = self.match_keywords(news_item)
         
         # Spam check
-        if self.contains_spam(title) or self.contains_spam(description):
+        if not hits.isdisjoint(self.spam_set):
             return False
         
         # Relevance check
-        if not self.contains_important_topic(title + ' ' + description):
+        if not any(hit in self.important_keywords for hit in hits):
             return False
         
         return True
 
     def contains_spam(self, text):
         """Check for spam content"""
-        text_lower = text.lower()
-        return any(spam in text_lower for spam in self.spam_keywords)
+        return not self.matcher.find_all(text).isdisjoint(self.spam_set)
 
     def contains_important_topic(self, text):
         """Check if text contains important topics"""
-        text_lower = text.lower()
-        return any(keyword in text_lower for keyword in self.important_keywords.keys())
+        return any(hit in self.important_keywords for hit in self.matcher.find_all(text))
 
-    def calculate_quality_score(self, news_item):
+    def calculate_quality_score(self, news_item, hits=None):
         """Calculate quality score for news item"""
         score = 0.0
-        content = (news_item.get('title', '') + ' ' + news_item.get('description', '')).lower()
+        if hits is None:
+            hits = self.match_keywords(news_item)
         
         # Keyword scoring
-        for keyword, weight in self.important_keywords.items():
-            if keyword in content:
-                score += weight
+        for hit in hits:
+            score += self.important_keywords.get(hit, 0)
         
         # Length scoring
-        title_len = len(news_item.get('title', ''))
-        desc_len = len(news_item.get('description', ''))
+        title_len = len(news_item.title)
+        desc_len = len(news_item.description)
         
         if title_len > 30:
             score += 2.0
@@ -97,8 +125,46 @@ class NewsManager:
             score += 3.0
         
         # Source reliability (you can expand this)
-        source = news_item.get('source', '').lower()
+        source = news_item.source.lower()
         if source in ['coingecko', 'coinranking']:
             score += 2.0
         
         return score
+
+    def is_near_duplicate(self, news_item):
+        """Check if a similar story was posted recently, possibly from another source"""
+        similarity = self.similarity_index.best_match_signature(self.similarity_signature(news_item))
+        if similarity >= SIMILARITY_THRESHOLD:
+            self.logger.info(f"👯 Near-duplicate story ({similarity:.0%} similar): {news_item.title[:50]}...")
+            return True
+        return False
+
+    def remember_posted(self, news_item):
+        """Add a posted story to the similarity index"""
+        self.similarity_index.add_signature(self.similarity_signature(news_item))
+
+    def similarity_signature(self, news_item):
+        """MinHash signature for the item, computed once and kept on it"""
+        if news_item.similarity_signature is None:
+            news_item.similarity_signature = self.similarity_index.signature(news_item.text_lower)
+        return news_item.similarity_signature
+
+    def seed_similarity_index(self, rows):
+        """Index past posts (title, content and posted_at rows) when there was no log to load"""
+        seeded = 0
+        for row in rows:
+            try:
+                timestamp = datetime.fromisoformat(row['posted_at']).timestamp()
+            except (KeyError, TypeError, ValueError):
+                continue
+            # The posted tweet stands in for the description, which isn't stored
+            text = f"{row.get('title') or ''} {row.get('content') or ''}"
+            self.similarity_index.add_signature(
+                self.similarity_index.signature(text), timestamp, persist=False
+            )
+            seeded += 1
+        self.needs_similarity_seed = False
+        if seeded:
+            self.similarity_index.compact()
+        self.logger.info(f"🌱 Seeded similarity index with {seeded} past posts")
+        return seeded
@@ -0,0 +1,143 @@
+import json
+import logging
+from .news_item import NewsItem
+
+# One entry per news source: where the feed lives, where the article list sits in the
+# response, and which response field feeds each news item field.
+NEWS_SCHEMAS = {
+    'coingecko': {
+        'url': 'https://coingecko.p.rapidapi.com/news',
+        'host': 'coingecko.p.rapidapi.com',
+        'articles_path': ('data', 'news'),
+        'fields': {
+            'title': 'title',
+            'description': 'description',
+            'url': 'url',
+            'published_at': 'created_at',
+            'author': 'author'
+        },
+        'limit': 10
+    },
+    'coinranking': {
+        'url': 'https://coinranking1.p.rapidapi.com/news',
+        'host': 'coinranking1.p.rapidapi.com',
+        'articles_path': ('data', 'news'),
+        'fields': {
+            'title': 'title',
+            'description': 'description',
+            'url': 'url',
+            'published_at': 'published_at',
+            'author': 'author'
+        },
+        'limit': 10
+    },
+    'coinpaprika': {
+        'url': 'https://coinpaprika1.p.rapidapi.com/news',
+        'host': 'coinpaprika1.p.rapidapi.com',
+        'articles_path': (),  # CoinPaprika returns the list directly
+        'fields': {
+            'title': 'title',
+            'description': 'description',
+            'url': 'url',
+            'published_at': 'date',
+            'author': 'author'
+        },
+        'limit': 10
+    }
+}
+
+_WHITESPACE = ' \t\n\r'
+
+def _skip_ws(text, idx):
+    while idx < len(text) and text[idx] in _WHITESPACE:
+        idx += 1
+    return idx
+
+def _expect(text, idx, char):
+    idx = _skip_ws(text, idx)
+    if idx >= len(text) or text[idx] != char:
+        raise ValueError(f"expected {char!r} at position {idx}")
+    return idx + 1
+
+class NewsExtractor:
+    """Compiled form of a source schema that pulls news items out of a response body"""
+
+    def __init__(self, source, schema):
+        self.logger = logging.getLogger(__name__)
+        self.source = source
+        self.path = tuple(schema.get('articles_path', ()))
+        self.limit = schema.get('limit', 10)
+        self.fields = tuple(schema['fields'].items())
+        self.decoder = json.JSONDecoder()
+
+    def build_item(self, article):
+        """Map one raw article onto a NewsItem"""
+        return NewsItem(source=self.source, **{field: article.get(key) for field, key in self.fields})
+
+    def extract(self, articles, is_valid):
+        """Build items from already-decoded articles, stopping at the limit"""
+        news_items = []
+        for article in articles:
+            if isinstance(article, dict) and is_valid(article):
+                news_items.append(self.build_item(article))
+                if len(news_items) >= self.limit:
+                    break
+        return news_items
+
+    def extract_from_data(self, data, is_valid):
+        """Extract items from a fully decoded response"""
+        articles = data
+        for key in self.path:
+            articles = articles.get(key) if isinstance(articles, dict) else None
+        return self.extract(articles if isinstance(articles, list) else [], is_valid)
+
+    def extract_from_text(self, text, is_valid):
+        """Extract items from a raw body, decoding only as many articles as needed"""
+        try:
+            return self.extract(self.iter_articles(text), is_valid)
+        except (ValueError, KeyError) as e:
+            # Unexpected layout: fall back to a full decode
+            self.logger.debug(f"Streaming decode of {self.source} failed ({e}), decoding fully")
+            return self.extract_from_data(json.loads(text), is_valid)
+
+    def iter_articles(self, text):
+        """Yield articles one at a time from the array at the schema path"""
+        decoder = self.decoder
+        idx = _skip_ws(text, 0)
+
+        # Walk down the object path, skipping sibling values we don't need
+        for key in self.path:
+            idx = _expect(text, idx, '{')
+            while True:
+                idx = _skip_ws(text, idx)
+                if idx < len(text) and text[idx] == '}':
+                    raise KeyError(key)
+                name, idx = decoder.raw_decode(text, idx)
+                idx = _expect(text, idx, ':')
+                idx = _skip_ws(text, idx)
+                if name == key:
+                    break
+                _, idx = decoder.raw_decode(text, idx)
+                idx = _skip_ws(text, idx)
+                if idx < len(text) and text[idx] == ',':
+                    idx += 1
+
+        idx = _expect(text, idx, '[')
+        while True:
+            idx = _skip_ws(text, idx)
+            if idx >= len(text):
+                raise ValueError("unterminated article list")
+            if text[idx] == ']':
+                return
+            article, idx = decoder.raw_decode(text, idx)
+            yield article
+            idx = _skip_ws(text, idx)
+            if idx < len(text) and text[idx] == ',':
+                idx += 1
+
+# Adding a schema above is all it takes to add a source
+NEWS_SOURCES = list(NEWS_SCHEMAS)
+
+def compile_schemas(schemas=NEWS_SCHEMAS):
+    """Compile every source schema into an extractor"""
+    return {source: NewsExtractor(source, schema) for source, schema in schemas.items()}
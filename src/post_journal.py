@@ -0,0 +1,125 @@
+import json
+import logging
+import os
+import threading
+from config import POST_JOURNAL_PATH, POST_JOURNAL_BATCH_SIZE, POST_JOURNAL_FLUSH_INTERVAL
+
+class PostJournal:
+    """Append-only local journal of posted_news rows, flushed to the database in batches"""
+
+    def __init__(self, writer, path=POST_JOURNAL_PATH, batch_size=POST_JOURNAL_BATCH_SIZE,
+                 flush_interval=POST_JOURNAL_FLUSH_INTERVAL):
+        self.logger = logging.getLogger(__name__)
+        self.writer = writer  # writer(records, replayed) -> True once the rows are stored
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        self.pending = []
+        self.replayed = 0  # leading pending records that came from a previous run
+        self.stats = {'appended': 0, 'flushed': 0, 'batches': 0, 'flush_errors': 0}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+
+        self.file = None
+        self.load()
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        # Start from a clean file so new appends never land on a torn line
+        self._rewrite()
+        self._thread = threading.Thread(target=self._loop, name='post-journal', daemon=True)
+        self._thread.start()
+
+    def load(self):
+        """Pick up records a previous run journaled but never flushed"""
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        self.pending.append(json.loads(line))
+                    except ValueError:
+                        # A torn final line from a crash mid-append
+                        self.logger.warning("⚠️ Skipping unreadable post journal line")
+        except FileNotFoundError:
+            return
+        self.replayed = len(self.pending)
+        if self.pending:
+            self.logger.info(f"📒 Replaying {len(self.pending)} journaled posts")
+            self._wake.set()
+
+    def append(self, record):
+        """Durably journal one record; it reaches the database on the next flush"""
+        with self._lock:
+            self.file.write(json.dumps(record) + '\n')
+            self.file.flush()
+            os.fsync(self.file.fileno())
+            self.pending.append(record)
+            self.stats['appended'] += 1
+            if len(self.pending) >= self.batch_size:
+                self._wake.set()
+
+    def pending_records(self):
+        with self._lock:
+            return list(self.pending)
+
+    def flush(self):
+        """Write pending records in batches; returns how many were stored"""
+        flushed = 0
+        with self._flush_lock:
+            while True:
+                with self._lock:
+                    batch = self.pending[:self.batch_size]
+                    replayed = self.replayed > 0
+                if not batch:
+                    break
+                try:
+                    ok = self.writer(batch, replayed)
+                except Exception as e:
+                    self.logger.error(f"❌ Post journal flush failed: {e}")
+                    ok = False
+                if not ok:
+                    self.stats['flush_errors'] += 1
+                    break
+
+                with self._lock:
+                    # Appends only go to the end, so the batch is still at the front
+                    del self.pending[:len(batch)]
+                    self.replayed = max(0, self.replayed - len(batch))
+                    self._rewrite()
+                    self.stats['flushed'] += len(batch)
+                    self.stats['batches'] += 1
+                flushed += len(batch)
+        return flushed
+
+    def _rewrite(self):
+        """Replace the journal with just the unflushed records"""
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for record in self.pending:
+                f.write(json.dumps(record) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        if self.file:
+            self.file.close()
+        os.replace(tmp_path, self.path)
+        self.file = open(self.path, 'a', encoding='utf-8')
+
+    def _loop(self):
+        while not self._stop.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    def close(self):
+        """Flush what we can and stop the background flusher"""
+        self._stop.set()
+        self._wake.set()
+        self.flush()
+
+    def get_stats(self):
+        with self._lock:
+            return {'pending': len(self.pending), **self.stats}
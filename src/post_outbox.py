@@ -0,0 +1,232 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from .news_item import NewsItem
+from config import (
+    OUTBOX_PATH, OUTBOX_MAX_ATTEMPTS, OUTBOX_RETRY_BASE, OUTBOX_RETRY_MAX,
+    OUTBOX_POLL_INTERVAL, OUTBOX_STARTUP_DELAY, OUTBOX_FAILED_RETENTION
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    title TEXT NOT NULL,
+    news TEXT NOT NULL,
+    content TEXT NOT NULL,
+    accounts TEXT NOT NULL,
+    posted_to TEXT NOT NULL DEFAULT '[]',
+    confirmed INTEGER NOT NULL DEFAULT 0,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    status TEXT NOT NULL DEFAULT 'pending',
+    last_error TEXT,
+    created_at REAL NOT NULL,
+    next_attempt_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS outbox_due ON outbox (status, next_attempt_at);
+"""
+
+class PostOutbox:
+    """Durable SQLite queue of generated tweets that have not been confirmed as posted yet"""
+
+    def __init__(self, path=OUTBOX_PATH, max_attempts=OUTBOX_MAX_ATTEMPTS):
+        self.logger = logging.getLogger(__name__)
+        self.path = path
+        self.max_attempts = max_attempts
+        self.stats = {'delivered': 0, 'retried': 0, 'given_up': 0}
+        self.claimed = set()
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        with self.conn:
+            self.conn.executescript(_SCHEMA)
+
+    def enqueue(self, news_item, content, accounts):
+        """Store a tweet before posting it so it survives failures and restarts"""
+        now = time.time()
+        with self._lock, self.conn:
+            cursor = self.conn.execute(
+                "INSERT INTO outbox (title, news, content, accounts, created_at, next_attempt_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (news_item.title, json.dumps(news_item.to_dict()), content, json.dumps(list(accounts)), now, now)
+            )
+            return cursor.lastrowid
+
+    def claim(self, entry_id=None, limit=10):
+        """Reserve due entries (or one specific entry) so only one caller delivers each"""
+        with self._lock:
+            if entry_id is not None:
+                rows = self.conn.execute(
+                    "SELECT * FROM outbox WHERE id = ? AND status = 'pending'", (entry_id,)
+                ).fetchall()
+            else:
+                rows = self.conn.execute(
+                    "SELECT * FROM outbox WHERE status = 'pending' AND next_attempt_at <= ? ORDER BY next_attempt_at LIMIT ?",
+                    (time.time(), limit + len(self.claimed))
+                ).fetchall()
+            entries = []
+            for row in rows:
+                if row['id'] in self.claimed:
+                    continue
+                self.claimed.add(row['id'])
+                entry = dict(row)
+                entry['accounts'] = json.loads(entry['accounts'])
+                entry['posted_to'] = json.loads(entry['posted_to'])
+                entries.append(entry)
+            return entries[:limit]
+
+    def deliver(self, entry, post, on_posted):
+        """Post a claimed entry to its remaining accounts; returns 'posted', 'pending' or 'failed'"""
+        try:
+            return self._deliver(entry, post, on_posted)
+        finally:
+            with self._lock:
+                self.claimed.discard(entry['id'])
+
+    def _deliver(self, entry, post, on_posted):
+        results = post({name: entry['content'] for name in entry['accounts']}) if entry['accounts'] else {}
+
+        posted_now = [name for name, result in results.items() if result['ok']]
+        retry = {name: result for name, result in results.items() if not result['ok'] and result.get('retryable')}
+        errors = [result['error'] for result in results.values() if not result['ok']]
+        posted_to = entry['posted_to'] + posted_now
+        attempts = entry['attempts']
+        # Waiting out a rate limit is not a failed attempt; errors are
+        if any(result.get('retry_after') is None for result in retry.values()):
+            attempts += 1
+
+        confirmed = entry['confirmed']
+        if posted_to and not confirmed:
+            # Only record the news as posted once Twitter has accepted the tweet
+            try:
+                confirmed = bool(on_posted(NewsItem.from_dict(json.loads(entry['news'])), entry['content']))
+            except Exception as e:
+                self.logger.error(f"❌ Confirming outbox entry {entry['id']} failed: {e}")
+                confirmed = False
+            if not confirmed:
+                attempts += 1
+                errors.append('confirmation failed')
+
+        if not retry and (confirmed or not posted_to):
+            status = 'posted' if posted_to else 'failed'
+        elif attempts >= self.max_attempts:
+            status = 'failed'
+        else:
+            status = 'pending'
+
+        if status == 'pending':
+            hints = [result['retry_after'] for result in retry.values() if result.get('retry_after')]
+            delay = min(hints) if hints else min(OUTBOX_RETRY_BASE * 2 ** max(attempts - 1, 0), OUTBOX_RETRY_MAX)
+            self.stats['retried'] += 1
+            self.logger.warning(f"📮 Outbox entry {entry['id']} will retry in {delay:.0f}s: {'; '.join(errors)}")
+        elif status == 'failed':
+            delay = 0
+            self.stats['given_up'] += 1
+            self.logger.error(f"❌ Giving up on outbox entry {entry['id']}: {'; '.join(errors)}")
+        else:
+            self.stats['delivered'] += 1
+
+        with self._lock, self.conn:
+            if status == 'posted':
+                self.conn.execute("DELETE FROM outbox WHERE id = ?", (entry['id'],))
+            else:
+                self.conn.execute(
+                    "UPDATE outbox SET accounts = ?, posted_to = ?, confirmed = ?, attempts = ?, status = ?, "
+                    "last_error = ?, next_attempt_at = ? WHERE id = ?",
+                    (json.dumps(list(retry)), json.dumps(posted_to), int(confirmed), attempts, status,
+                     '; '.join(errors) or None, time.time() + max(delay, 1), entry['id'])
+                )
+
+        # A partial multi-account post still counts as posted for the cycle
+        return 'posted' if posted_to and confirmed else status
+
+    def deliver_now(self, entry_id, post, on_posted):
+        """Deliver one entry right away, e.g. straight after enqueueing it"""
+        entries = self.claim(entry_id=entry_id)
+        if not entries:
+            return 'pending'
+        return self.deliver(entries[0], post, on_posted)
+
+    def drain(self, post, on_posted, limit=10):
+        """Deliver every due entry; returns how many got posted"""
+        return sum(self.deliver(entry, post, on_posted) == 'posted' for entry in self.claim(limit=limit))
+
+    def purge_failed(self, retention=OUTBOX_FAILED_RETENTION):
+        """Delete given-up entries queued more than retention seconds ago; returns how many"""
+        with self._lock, self.conn:
+            deleted = self.conn.execute(
+                "DELETE FROM outbox WHERE status = 'failed' AND created_at < ?", (time.time() - retention,)
+            ).rowcount
+        if deleted:
+            self.logger.info(f"🧹 Purged {deleted} failed outbox entries")
+        return deleted
+
+    def pending_titles(self):
+        """Titles waiting in the outbox, so cycles don't generate them again"""
+        with self._lock:
+            rows = self.conn.execute("SELECT title FROM outbox WHERE status = 'pending'").fetchall()
+        return {row['title'] for row in rows}
+
+    def next_due_in(self):
+        """Seconds until the next pending entry is due, or None when nothing is pending"""
+        with self._lock:
+            row = self.conn.execute("SELECT MIN(next_attempt_at) FROM outbox WHERE status = 'pending'").fetchone()
+        if row[0] is None:
+            return None
+        return max(0.0, row[0] - time.time())
+
+    def get_stats(self):
+        with self._lock:
+            counts = dict(self.conn.execute("SELECT status, COUNT(*) FROM outbox GROUP BY status").fetchall())
+        return {
+            'pending': counts.get('pending', 0),
+            'failed': counts.get('failed', 0),
+            **self.stats
+        }
+
+class OutboxWorker:
+    """Background thread that retries queued tweets when they come due"""
+
+    def __init__(self, bot, poll_interval=OUTBOX_POLL_INTERVAL):
+        self.logger = logging.getLogger(__name__)
+        self.bot = bot
+        self.poll_interval = poll_interval
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self, initial_delay=OUTBOX_STARTUP_DELAY):
+        if self._thread:
+            return
+        self._thread = threading.Thread(target=self._loop, args=(initial_delay,), name='outbox-worker', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+    def wake(self):
+        """Re-check the outbox now, e.g. after something new was queued"""
+        self._wake.set()
+
+    def _loop(self, initial_delay):
+        if self._stop.wait(initial_delay):
+            return
+        while not self._stop.is_set():
+            try:
+                self.bot.outbox.purge_failed()
+                due_in = self.bot.outbox.next_due_in()
+                if due_in is not None and due_in <= 0:
+                    posted = self.bot.drain_outbox()
+                    if posted:
+                        self.logger.info(f"📮 Posted {posted} queued tweets from the outbox")
+                    due_in = self.bot.outbox.next_due_in()
+            except Exception as e:
+                self.logger.error(f"❌ Outbox drain failed: {e}")
+                due_in = None
+            wait = self.poll_interval if due_in is None else min(self.poll_interval, due_in)
+            self._wake.wait(wait)
+            self._wake.clear()
@@ -0,0 +1,105 @@
+import logging
+import queue
+import random
+import threading
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from config import POSTING_INTERVAL, SCHEDULER_JITTER, SCHEDULER_MAX_JOBS
+
+class BotScheduler:
+    """Runs bot cycles on a single background worker so runs never overlap"""
+
+    def __init__(self, bot, interval_minutes=POSTING_INTERVAL, jitter=SCHEDULER_JITTER, max_jobs=SCHEDULER_MAX_JOBS):
+        self.logger = logging.getLogger(__name__)
+        self.bot = bot
+        self.interval = interval_minutes * 60
+        self.jitter = jitter
+        self.max_jobs = max_jobs
+
+        self.jobs = OrderedDict()
+        self.job_queue = queue.Queue()
+        self.queued_job_id = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._threads = []
+
+    def start(self, periodic=True):
+        """Start the worker, and the periodic timer when requested"""
+        if self._threads:
+            return
+        self._threads.append(threading.Thread(target=self._worker, name='bot-worker', daemon=True))
+        if periodic:
+            self._threads.append(threading.Thread(target=self._timer, name='bot-timer', daemon=True))
+        for thread in self._threads:
+            thread.start()
+        self.logger.info(f"⏱️ Scheduler started (periodic={'on' if periodic else 'off'}, every {self.interval}s ± {self.jitter}s)")
+
+    def stop(self):
+        """Stop scheduling new cycles"""
+        self._stop.set()
+        self.job_queue.put(None)
+
+    def submit(self, trigger='manual'):
+        """Queue a cycle; a cycle that is already waiting to run is reused"""
+        with self._lock:
+            if self.queued_job_id:
+                return dict(self.jobs[self.queued_job_id])
+
+            job_id = uuid.uuid4().hex[:12]
+            self.jobs[job_id] = {
+                'id': job_id,
+                'status': 'queued',
+                'trigger': trigger,
+                'created_at': datetime.now().isoformat(),
+                'started_at': None,
+                'finished_at': None,
+                'result': None,
+                'error': None
+            }
+            self.queued_job_id = job_id
+            while len(self.jobs) > self.max_jobs:
+                self.jobs.popitem(last=False)
+            job = dict(self.jobs[job_id])
+
+        self.job_queue.put(job_id)
+        return job
+
+    def get_job(self, job_id):
+        """Status of a job, or None if unknown or expired"""
+        with self._lock:
+            job = self.jobs.get(job_id)
+            return dict(job) if job else None
+
+    def _update_job(self, job_id, **fields):
+        with self._lock:
+            if job_id in self.jobs:
+                self.jobs[job_id].update(fields)
+
+    def _worker(self):
+        while not self._stop.is_set():
+            job_id = self.job_queue.get()
+            if job_id is None:
+                break
+
+            with self._lock:
+                if self.queued_job_id == job_id:
+                    self.queued_job_id = None
+            self._update_job(job_id, status='running', started_at=datetime.now().isoformat())
+
+            try:
+                success = self.bot.run_single_cycle()
+                self._update_job(job_id, status='succeeded', result='posted' if success else 'skipped')
+            except Exception as e:
+                self.logger.error(f"❌ Scheduled cycle {job_id} failed: {e}")
+                self._update_job(job_id, status='failed', error=str(e))
+            finally:
+                self._update_job(job_id, finished_at=datetime.now().isoformat())
+
+    def _timer(self):
+        while True:
+            delay = max(self.interval + random.uniform(-self.jitter, self.jitter), 1)
+            if self._stop.wait(delay):
+                break
+            job = self.submit(trigger='scheduled')
+            self.logger.info(f"⏱️ Scheduled cycle queued: {job['id']}")
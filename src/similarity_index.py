@@ -0,0 +1,192 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import struct
+import threading
+import time
+from config import (
+    SIMILARITY_INDEX_PATH, SIMILARITY_THRESHOLD,
+    SIMILARITY_WINDOW_DAYS, SIMILARITY_MAX_ENTRIES
+)
+
+_WORD = re.compile(r'[a-z0-9$]+')
+_STOPWORDS = frozenset({
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'has', 'have',
+    'in', 'is', 'it', 'its', 'of', 'on', 'or', 'that', 'the', 'this', 'to', 'was',
+    'will', 'with', 'after', 'over', 'into', 'new', 'says'
+})
+
+class SimilarityIndex:
+    """MinHash/LSH index for spotting the same story told with different wording"""
+
+    NUM_BANDS = 30
+    ROWS_PER_BAND = 2
+
+    def __init__(self, path=SIMILARITY_INDEX_PATH, max_entries=SIMILARITY_MAX_ENTRIES):
+        self.logger = logging.getLogger(__name__)
+        self.path = path
+        self.max_entries = max_entries
+        self.num_perm = self.NUM_BANDS * self.ROWS_PER_BAND
+
+        # One SHAKE digest per shingle yields every 32-bit hash function in a single call
+        self._digest_size = self.num_perm * 4
+        self._unpack = struct.Struct(f'<{self.num_perm}I').unpack
+
+        self.entries = {}  # entry id -> (signature, posted timestamp)
+        self.buckets = {}  # (band, band signature) -> set of entry ids
+        self.next_id = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def shingles(text):
+        """Word unigrams and bigrams with stopwords removed"""
+        words = [w for w in _WORD.findall((text or '').lower()) if w not in _STOPWORDS]
+        shingles = set(words)
+        shingles.update(f'{a} {b}' for a, b in zip(words, words[1:]))
+        return shingles
+
+    def signature(self, text):
+        """MinHash signature for text"""
+        hashes = [
+            self._unpack(hashlib.shake_128(s.encode('utf-8')).digest(self._digest_size))
+            for s in self.shingles(text)
+        ]
+        if not hashes:
+            return None
+        return tuple(map(min, zip(*hashes)))
+
+    def _bands(self, signature):
+        rows = self.ROWS_PER_BAND
+        return [(band, signature[band * rows:(band + 1) * rows]) for band in range(self.NUM_BANDS)]
+
+    def add(self, text, timestamp=None, persist=True):
+        """Index a posted story and append it to the on-disk log"""
+        self.add_signature(self.signature(text), timestamp, persist)
+
+    def add_signature(self, signature, timestamp=None, persist=True):
+        """Index a story whose signature is already computed"""
+        if signature is None:
+            return
+        timestamp = timestamp or time.time()
+        with self._lock:
+            self._insert(signature, timestamp)
+            if len(self.entries) > self.max_entries:
+                self._evict_oldest(len(self.entries) - self.max_entries)
+        if persist:
+            self._append(signature, timestamp)
+
+    def _insert(self, signature, timestamp):
+        entry_id = self.next_id
+        self.next_id += 1
+        self.entries[entry_id] = (signature, timestamp)
+        for band in self._bands(signature):
+            self.buckets.setdefault(band, set()).add(entry_id)
+
+    def _remove(self, entry_id):
+        signature, _ = self.entries.pop(entry_id)
+        for band in self._bands(signature):
+            bucket = self.buckets.get(band)
+            if bucket:
+                bucket.discard(entry_id)
+                if not bucket:
+                    del self.buckets[band]
+
+    def _evict_oldest(self, count):
+        oldest = sorted(self.entries, key=lambda entry_id: self.entries[entry_id][1])[:count]
+        for entry_id in oldest:
+            self._remove(entry_id)
+
+    def best_match(self, text, window_days=SIMILARITY_WINDOW_DAYS):
+        """Highest estimated Jaccard similarity to any story posted within the window"""
+        return self.best_match_signature(self.signature(text), window_days)
+
+    def best_match_signature(self, signature, window_days=SIMILARITY_WINDOW_DAYS):
+        """best_match for a signature that is already computed"""
+        if signature is None:
+            return 0.0
+        cutoff = time.time() - window_days * 86400
+
+        with self._lock:
+            candidates = set()
+            for band in self._bands(signature):
+                candidates.update(self.buckets.get(band, ()))
+
+            best = 0.0
+            for entry_id in candidates:
+                other, timestamp = self.entries[entry_id]
+                if timestamp < cutoff:
+                    continue
+                matches = sum(1 for x, y in zip(signature, other) if x == y)
+                best = max(best, matches / self.num_perm)
+        return best
+
+    def is_similar(self, text, threshold=SIMILARITY_THRESHOLD, window_days=SIMILARITY_WINDOW_DAYS):
+        """Have we posted something at least threshold-similar in the last window_days?"""
+        return self.best_match(text, window_days) >= threshold
+
+    def __len__(self):
+        with self._lock:
+            return len(self.entries)
+
+    def prune(self, max_age_days):
+        """Drop entries older than max_age_days"""
+        cutoff = time.time() - max_age_days * 86400
+        with self._lock:
+            expired = [entry_id for entry_id, (_, ts) in self.entries.items() if ts < cutoff]
+            for entry_id in expired:
+                self._remove(entry_id)
+        return len(expired)
+
+    def load(self):
+        """Replay the on-disk signature log"""
+        if not self.path or not os.path.exists(self.path):
+            return False
+        try:
+            with open(self.path, 'r') as f, self._lock:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    signature, timestamp = json.loads(line)
+                    if len(signature) != self.num_perm:
+                        continue
+                    self._insert(tuple(signature), timestamp)
+                if len(self.entries) > self.max_entries:
+                    self._evict_oldest(len(self.entries) - self.max_entries)
+            self.logger.info(f"📂 Loaded similarity index with {len(self.entries)} stories")
+            return True
+        except Exception as e:
+            self.logger.error(f"❌ Error loading similarity index: {e}")
+            return False
+
+    def _append(self, signature, timestamp):
+        if not self.path:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            with open(self.path, 'a') as f:
+                f.write(json.dumps([signature, timestamp], separators=(',', ':')) + '\n')
+        except Exception as e:
+            self.logger.error(f"❌ Error appending to similarity index: {e}")
+
+    def compact(self):
+        """Rewrite the log with only the live entries"""
+        if not self.path:
+            return False
+        try:
+            with self._lock:
+                lines = [
+                    json.dumps([sig, ts], separators=(',', ':'))
+                    for sig, ts in sorted(self.entries.values(), key=lambda entry: entry[1])
+                ]
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            tmp_path = self.path + '.tmp'
+            with open(tmp_path, 'w') as f:
+                f.write('\n'.join(lines) + ('\n' if lines else ''))
+            os.replace(tmp_path, self.path)
+            return True
+        except Exception as e:
+            self.logger.error(f"❌ Error compacting similarity index: {e}")
+            return False
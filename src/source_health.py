@@ -0,0 +1,155 @@
+import logging
+import random
+import threading
+import time
+from collections import deque
+from .metrics import SOURCE_BREAKER_TOTAL
+from config import (
+    SOURCE_HEALTH_ALPHA, SOURCE_BREAKER_FAILURES, SOURCE_BREAKER_COOLDOWN, SOURCE_BREAKER_MAX_COOLDOWN,
+    HEDGE_MIN_SAMPLES
+)
+
+LATENCY_WINDOW = 200  # recent successful fetch latencies kept per source
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+class SourceHealth:
+    """Rolling latency, error rate and yield per news source, with a circuit breaker each"""
+
+    def __init__(self, sources, alpha=SOURCE_HEALTH_ALPHA, failure_threshold=SOURCE_BREAKER_FAILURES,
+                 cooldown=SOURCE_BREAKER_COOLDOWN, max_cooldown=SOURCE_BREAKER_MAX_COOLDOWN):
+        self.logger = logging.getLogger(__name__)
+        self.alpha = alpha
+        self.failure_threshold = failure_threshold
+        self.base_cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.sources = {source: self._new_state() for source in sources}
+        self._lock = threading.Lock()
+
+    def _new_state(self):
+        # Optimistic priors so untried sources still get picked
+        return {
+            'latency': 1.0,
+            'error_rate': 0.0,
+            'yield': 5.0,
+            'fetches': 0,
+            'consecutive_failures': 0,
+            'state': CLOSED,
+            'opened_at': 0.0,
+            'cooldown': self.base_cooldown,
+            'probing': False,
+            'samples': deque(maxlen=LATENCY_WINDOW)
+        }
+
+    def _transition(self, source, health, state):
+        health['state'] = state
+        SOURCE_BREAKER_TOTAL.inc(source=source, state=state)
+
+    def allow(self, source):
+        """Whether a fetch may go out now; an open circuit lets one probe through after its cooldown"""
+        with self._lock:
+            health = self.sources.setdefault(source, self._new_state())
+            if health['state'] == CLOSED:
+                return True
+            if health['state'] == OPEN:
+                if time.monotonic() - health['opened_at'] < health['cooldown']:
+                    return False
+                self._transition(source, health, HALF_OPEN)
+                self.logger.info(f"🔌 {source} circuit half-open, probing")
+            if health['probing']:
+                return False
+            health['probing'] = True
+            return True
+
+    def record(self, source, ok, latency, items=0):
+        """Fold one fetch into the source's averages and breaker state"""
+        with self._lock:
+            health = self.sources.setdefault(source, self._new_state())
+            a = self.alpha
+            health['fetches'] += 1
+            health['latency'] = (1 - a) * health['latency'] + a * latency
+            health['error_rate'] = (1 - a) * health['error_rate'] + a * (0.0 if ok else 1.0)
+            if ok:
+                health['yield'] = (1 - a) * health['yield'] + a * items
+                health['samples'].append(latency)
+
+            was_probe = health['state'] == HALF_OPEN
+            health['probing'] = False
+            if ok:
+                health['consecutive_failures'] = 0
+                if health['state'] != CLOSED:
+                    self._transition(source, health, CLOSED)
+                    health['cooldown'] = self.base_cooldown
+                    self.logger.info(f"✅ {source} circuit closed again")
+                return
+
+            health['consecutive_failures'] += 1
+            if was_probe:
+                # The source is still failing: wait longer before the next probe
+                health['cooldown'] = min(health['cooldown'] * 2, self.max_cooldown)
+            if was_probe or health['consecutive_failures'] >= self.failure_threshold:
+                if health['state'] != OPEN:
+                    self._transition(source, health, OPEN)
+                health['opened_at'] = time.monotonic()
+                self.logger.warning(f"🚫 {source} circuit open for {health['cooldown']}s")
+
+    def weight(self, source):
+        """Expected useful articles per second of waiting, for weighted picks"""
+        with self._lock:
+            health = self.sources.setdefault(source, self._new_state())
+            score = (1 - health['error_rate']) * (health['yield'] + 1) / (1 + health['latency'])
+        # Keep a little exploration so a recovered source can win back traffic
+        return max(score, 0.05)
+
+    def latency_percentile(self, source, pct, min_samples=HEDGE_MIN_SAMPLES):
+        """Percentile of the source's recent successful fetch latency, or None with too few samples"""
+        with self._lock:
+            health = self.sources.get(source)
+            samples = sorted(health['samples']) if health else []
+        if len(samples) < min_samples:
+            return None
+        return samples[min(int(len(samples) * pct / 100), len(samples) - 1)]
+
+    def release(self, source):
+        """Give back a half-open probe slot whose fetch was cancelled before it finished"""
+        with self._lock:
+            health = self.sources.get(source)
+            if health:
+                health['probing'] = False
+
+    def can_attempt(self, source):
+        """Like allow() but without claiming the half-open probe"""
+        with self._lock:
+            health = self.sources.get(source)
+            if health is None or health['state'] == CLOSED:
+                return True
+            if health['state'] == OPEN:
+                return time.monotonic() - health['opened_at'] >= health['cooldown']
+            return not health['probing']
+
+    def available(self, sources):
+        """Sources whose circuit would let a fetch through, best first"""
+        return sorted((source for source in sources if self.can_attempt(source)), key=self.weight, reverse=True)
+
+    def choose(self, sources):
+        """Weighted random pick among sources whose circuit would let a fetch through"""
+        allowed = [source for source in sources if self.can_attempt(source)]
+        if not allowed:
+            return None
+        return random.choices(allowed, weights=[self.weight(source) for source in allowed])[0]
+
+    def get_stats(self):
+        with self._lock:
+            return {
+                source: {
+                    'state': health['state'],
+                    'latency_ms': round(health['latency'] * 1000, 1),
+                    'error_rate': round(health['error_rate'], 3),
+                    'yield': round(health['yield'], 2),
+                    'fetches': health['fetches'],
+                    'cooldown': health['cooldown']
+                }
+                for source, health in self.sources.items()
+            }
@@ -0,0 +1,158 @@
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+from .metrics import track_call
+from .storage import StorageBackend
+from config import SQLITE_PATH
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS posted_news (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    title TEXT NOT NULL,
+    url TEXT,
+    content TEXT,
+    source TEXT,
+    posted_at TEXT NOT NULL,
+    title_hash INTEGER NOT NULL,
+    url_hash INTEGER
+);
+CREATE INDEX IF NOT EXISTS posted_news_title_hash ON posted_news (title_hash);
+CREATE INDEX IF NOT EXISTS posted_news_url_hash ON posted_news (url_hash);
+CREATE INDEX IF NOT EXISTS posted_news_posted_at ON posted_news (posted_at);
+"""
+
+# Fixed SQL text so sqlite3's per-connection statement cache prepares each one once
+_IS_TITLE_POSTED = "SELECT 1 FROM posted_news WHERE title_hash = ? AND title = ? LIMIT 1"
+_IS_URL_POSTED = "SELECT 1 FROM posted_news WHERE url_hash = ? AND url = ? LIMIT 1"
+_INSERT_POST = (
+    "INSERT INTO posted_news (title, url, content, source, posted_at, title_hash, url_hash) "
+    "VALUES (:title, :url, :content, :source, :posted_at, :title_hash, :url_hash)"
+)
+_RECENT_POSTS = "SELECT title, url, content, source, posted_at FROM posted_news ORDER BY posted_at DESC LIMIT ?"
+_COUNT_BY_SOURCE = "SELECT COALESCE(source, 'unknown'), COUNT(*) FROM posted_news GROUP BY source"
+_POSTED_SINCE = "SELECT posted_at FROM posted_news WHERE posted_at >= ? ORDER BY posted_at"
+_DELETE_OLDER = "DELETE FROM posted_news WHERE posted_at < ?"
+
+def key_hash(value):
+    """Signed 64-bit hash of a title or url, small enough for an integer index"""
+    if not value:
+        return None
+    digest = hashlib.blake2b(value.encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'big', signed=True)
+
+class SQLiteStorage(StorageBackend):
+    """posted_news in a local SQLite file in WAL mode"""
+
+    name = 'sqlite'
+    local = True
+
+    def __init__(self, path=SQLITE_PATH):
+        self.logger = logging.getLogger(__name__)
+        self.path = path
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        conn = self._conn()
+        # WAL lets cycle reads run while the journal or a backfill is writing
+        conn.execute("PRAGMA journal_mode=WAL")
+        with conn:
+            conn.executescript(_SCHEMA)
+
+    def _conn(self):
+        """One connection per thread, each with its own prepared statement cache"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10, cached_statements=64)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def is_posted(self, title, url=None):
+        with track_call('sqlite', 'is_news_posted'):
+            conn = self._conn()
+            if conn.execute(_IS_TITLE_POSTED, (key_hash(title), title)).fetchone():
+                return True
+            if url:
+                return conn.execute(_IS_URL_POSTED, (key_hash(url), url)).fetchone() is not None
+            return False
+
+    def find_posted(self, titles, urls):
+        titles = [title for title in titles if title]
+        urls = [url for url in urls if url]
+        with track_call('sqlite', 'filter_unposted'):
+            title_hashes = [key_hash(title) for title in titles]
+            url_hashes = [key_hash(url) for url in urls]
+            rows = self._conn().execute(
+                f"SELECT title, url FROM posted_news WHERE title_hash IN ({','.join('?' * len(title_hashes))}) "
+                f"OR url_hash IN ({','.join('?' * len(url_hashes))})",
+                title_hashes + url_hashes
+            ).fetchall()
+        # Hashes only narrow the scan; compare the actual values
+        wanted_titles, wanted_urls = set(titles), set(urls)
+        posted_titles = {title for title, _ in rows if title in wanted_titles}
+        posted_urls = {url for _, url in rows if url in wanted_urls}
+        return posted_titles, posted_urls
+
+    def insert_posts(self, records):
+        rows = [
+            {
+                'title': record['title'],
+                'url': record.get('url'),
+                'content': record.get('content'),
+                'source': record.get('source'),
+                'posted_at': record['posted_at'],
+                'title_hash': key_hash(record['title']),
+                'url_hash': key_hash(record.get('url'))
+            }
+            for record in records
+        ]
+        with track_call('sqlite', 'insert_posted_batch'), self._write_lock:
+            conn = self._conn()
+            with conn:
+                conn.executemany(_INSERT_POST, rows)
+        return True
+
+    def recent_posts(self, limit):
+        with track_call('sqlite', 'get_recent_posts'):
+            rows = self._conn().execute(_RECENT_POSTS, (limit,)).fetchall()
+        return [
+            {'title': title, 'url': url, 'content': content, 'source': source, 'posted_at': posted_at}
+            for title, url, content, source, posted_at in rows
+        ]
+
+    def rows_since(self, since, offset, limit, fields=('title', 'url', 'posted_at')):
+        columns = ', '.join(field for field in fields if field in ('title', 'url', 'content', 'source', 'posted_at'))
+        with track_call('sqlite', 'rows_since'):
+            rows = self._conn().execute(
+                f"SELECT {columns} FROM posted_news WHERE posted_at > ? ORDER BY posted_at LIMIT ? OFFSET ?",
+                (since or '', limit, offset)
+            ).fetchall()
+        names = columns.split(', ')
+        return [dict(zip(names, row)) for row in rows]
+
+    def stats_snapshot(self, sources, since):
+        with track_call('sqlite', 'load_stats_counters'):
+            conn = self._conn()
+            source_stats = dict(conn.execute(_COUNT_BY_SOURCE).fetchall())
+            recent = [posted_at for (posted_at,) in conn.execute(_POSTED_SINCE, (since,)).fetchall()]
+        return {
+            'total': sum(source_stats.values()),
+            'source_stats': {source: count for source, count in source_stats.items() if count},
+            'recent': recent
+        }
+
+    def delete_older_than(self, cutoff):
+        with track_call('sqlite', 'cleanup_old_records'), self._write_lock:
+            conn = self._conn()
+            with conn:
+                return conn.execute(_DELETE_OLDER, (cutoff,)).rowcount
+
+    def count(self):
+        return self._conn().execute("SELECT COUNT(*) FROM posted_news").fetchone()[0]
+
+    def ping(self):
+        self._conn().execute("SELECT 1").fetchone()
+        return True
@@ -0,0 +1,58 @@
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+class StartupProfile:
+    """Records how long imports and component initialization take"""
+
+    def __init__(self):
+        self.process_started = time.perf_counter()
+        self.started_at = datetime.now().isoformat()
+        self.entries = []
+        self.ready_after = None
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def measure(self, component, phase):
+        """Time one phase ('import', 'init', ...) of a component"""
+        started = time.perf_counter()
+        error = None
+        try:
+            yield
+        except BaseException as e:
+            error = str(e)
+            raise
+        finally:
+            entry = {
+                'component': component,
+                'phase': phase,
+                'ms': round((time.perf_counter() - started) * 1000, 1),
+                'since_start_ms': round((started - self.process_started) * 1000, 1),
+                'thread': threading.current_thread().name
+            }
+            if error:
+                entry['error'] = error
+            with self._lock:
+                self.entries.append(entry)
+
+    def mark_ready(self):
+        """Note when the app finished its startup path"""
+        self.ready_after = round((time.perf_counter() - self.process_started) * 1000, 1)
+
+    def report(self):
+        """Per-component breakdown of import and init cost"""
+        with self._lock:
+            entries = list(self.entries)
+        components = {}
+        for entry in entries:
+            phases = components.setdefault(entry['component'], {})
+            phases[entry['phase']] = phases.get(entry['phase'], 0) + entry['ms']
+        return {
+            'started_at': self.started_at,
+            'ready_after_ms': self.ready_after,
+            'components': components,
+            'timeline': entries
+        }
+
+startup_profile = StartupProfile()
@@ -0,0 +1,39 @@
+from abc import ABC, abstractmethod
+
+class StorageBackend(ABC):
+    """Where posted_news rows live; DatabaseManager talks to this instead of a specific database"""
+
+    name = 'unknown'
+    local = False  # True when calls never leave the machine
+
+    @abstractmethod
+    def is_posted(self, title, url=None):
+        """Whether a row with this title (or url) exists"""
+
+    @abstractmethod
+    def find_posted(self, titles, urls):
+        """Titles and urls among the given ones that exist, as two sets"""
+
+    @abstractmethod
+    def insert_posts(self, records):
+        """Insert rows with title, url, content, source and posted_at; True once stored"""
+
+    @abstractmethod
+    def recent_posts(self, limit):
+        """Newest rows first"""
+
+    @abstractmethod
+    def rows_since(self, since, offset, limit, fields=('title', 'url', 'posted_at')):
+        """Rows posted after since (all rows when None), oldest first, one page at a time"""
+
+    @abstractmethod
+    def stats_snapshot(self, sources, since):
+        """Total count, per-source counts and posted_at values at or after since"""
+
+    @abstractmethod
+    def delete_older_than(self, cutoff):
+        """Delete rows posted before cutoff; returns how many were deleted"""
+
+    @abstractmethod
+    def ping(self):
+        """Cheap round trip that raises when the backend is unreachable"""
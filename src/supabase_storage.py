@@ -0,0 +1,130 @@
+import logging
+from .metrics import track_call
+from .storage import StorageBackend
+
+class SupabaseStorage(StorageBackend):
+    """posted_news in Supabase, reached through PostgREST over the network"""
+
+    name = 'supabase'
+    local = False
+
+    def __init__(self, client):
+        self.logger = logging.getLogger(__name__)
+        self.client = client
+
+    def _execute(self, query, operation):
+        """Execute a Supabase query, recording its latency and outcome"""
+        with track_call('supabase', operation) as call:
+            response = query.execute()
+            call.payload_bytes = len(str(response.data)) if response.data else 0
+            return response
+
+    @staticmethod
+    def _postgrest_list(values):
+        """Quote values for a PostgREST in.() filter"""
+        quoted = []
+        for value in values:
+            escaped = str(value).replace('\\', '\\\\').replace('"', '\\"')
+            quoted.append(f'"{escaped}"')
+        return ','.join(quoted)
+
+    def is_posted(self, title, url=None):
+        query = self.client.table('posted_news')\
+            .select('id')\
+            .eq('title', title)
+        response = self._execute(query, 'is_news_posted')
+        exists = len(response.data) > 0
+
+        if not exists and url:
+            query = self.client.table('posted_news')\
+                .select('id')\
+                .eq('url', url)
+            response = self._execute(query, 'is_news_posted')
+            exists = len(response.data) > 0
+        return exists
+
+    def find_posted(self, titles, urls):
+        # One query for every candidate
+        filters = f"title.in.({self._postgrest_list(titles)})"
+        if urls:
+            filters += f",url.in.({self._postgrest_list(urls)})"
+
+        query = self.client.table('posted_news')\
+            .select('title, url')\
+            .or_(filters)
+        response = self._execute(query, 'filter_unposted')
+
+        posted_titles = {row.get('title') for row in response.data}
+        posted_urls = {row.get('url') for row in response.data if row.get('url')}
+        return posted_titles, posted_urls
+
+    def insert_posts(self, records):
+        response = self._execute(self.client.table('posted_news').insert(records), 'insert_posted_batch')
+        if response.data:
+            return True
+        self.logger.error(f"❌ Failed to insert posts into Supabase: {response.error}")
+        return False
+
+    def recent_posts(self, limit):
+        query = self.client.table('posted_news')\
+            .select('*')\
+            .order('posted_at', desc=True)\
+            .limit(limit)
+        return self._execute(query, 'get_recent_posts').data
+
+    def rows_since(self, since, offset, limit, fields=('title', 'url', 'posted_at')):
+        query = self.client.table('posted_news').select(', '.join(fields))
+        if since:
+            query = query.gt('posted_at', since)
+        return self._execute(query.order('posted_at').range(offset, offset + limit - 1), 'rows_since').data
+
+    def stats_snapshot(self, sources, since):
+        """Counts done server-side instead of scanning the table"""
+        query = self.client.table('posted_news')\
+            .select('id', count='exact')\
+            .limit(1)
+        total_response = self._execute(query, 'load_stats_counters')
+
+        # Source distribution, counted per source by the database
+        source_stats = {}
+        for source in sources:
+            query = self.client.table('posted_news')\
+                .select('id', count='exact')\
+                .eq('source', source)\
+                .limit(1)
+            source_response = self._execute(query, 'load_stats_counters')
+            if source_response.count:
+                source_stats[source] = source_response.count
+
+        # Posts since the cutoff (bounded by the posting interval)
+        query = self.client.table('posted_news')\
+            .select('posted_at')\
+            .gte('posted_at', since)\
+            .order('posted_at')
+        recent_response = self._execute(query, 'load_stats_counters')
+
+        # Sources outside the list are counted together so the breakdown adds up to the total
+        total = total_response.count or 0
+        other = total - sum(source_stats.values())
+        if other > 0:
+            source_stats['other'] = source_stats.get('other', 0) + other
+
+        return {
+            'total': total,
+            'source_stats': source_stats,
+            'recent': [item['posted_at'] for item in recent_response.data]
+        }
+
+    def delete_older_than(self, cutoff):
+        query = self.client.table('posted_news')\
+            .delete()\
+            .lt('posted_at', cutoff)
+        response = self._execute(query, 'cleanup_old_records')
+        return len(response.data) if response.data else 0
+
+    def ping(self):
+        query = self.client.table('posted_news')\
+            .select('id')\
+            .limit(1)
+        self._execute(query, 'health_check')
+        return True
@@ -0,0 +1,60 @@
+import threading
+import time
+
+class TokenBucket:
+    """Thread-safe token bucket that refills continuously up to its capacity"""
+
+    def __init__(self, capacity, period):
+        self.capacity = float(capacity)
+        self.rate = self.capacity / period  # tokens per second
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def try_acquire(self, tokens=1):
+        """Take tokens if available right now, without waiting"""
+        with self._lock:
+            now = time.monotonic()
+            if now < self.blocked_until:
+                return False
+            self._refill(now)
+            if self.tokens >= tokens:
+                self.tokens -= tokens
+                return True
+            return False
+
+    def refund(self, tokens=1):
+        """Give back tokens for a request that never reached the server"""
+        with self._lock:
+            self.tokens = min(self.capacity, self.tokens + tokens)
+
+    def block_for(self, seconds):
+        """Hold the bucket empty for a while, e.g. until a server-side rate limit resets"""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = 0.0
+            self.updated = now
+            self.blocked_until = max(self.blocked_until, now + max(0.0, seconds))
+
+    def wait_time(self, tokens=1):
+        """Seconds until tokens would be available"""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            blocked = max(0.0, self.blocked_until - now)
+            missing = max(0.0, tokens - self.tokens)
+            return max(blocked, missing / self.rate)
+
+    def get_stats(self):
+        with self._lock:
+            self._refill(time.monotonic())
+            return {
+                'tokens': round(self.tokens, 2),
+                'capacity': self.capacity,
+                'blocked_for': round(max(0.0, self.blocked_until - time.monotonic()), 1)
+            }
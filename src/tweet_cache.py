@@ -0,0 +1,133 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from .dedup_index import normalize_text
+from config import TWEET_CACHE_PATH, TWEET_CACHE_SIZE, TWEET_CACHE_TTL
+
+class TweetCache:
+    """Bounded LRU/TTL cache of validated tweets keyed by article and style"""
+
+    def __init__(self, path=TWEET_CACHE_PATH, max_entries=TWEET_CACHE_SIZE, ttl=TWEET_CACHE_TTL):
+        self.logger = logging.getLogger(__name__)
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+
+        self.entries = OrderedDict()  # (article key, style) -> entry
+        self.stats = {'hits': 0, 'misses': 0, 'latency_saved': 0.0}
+        self._lock = threading.Lock()
+        self.load()
+
+    @staticmethod
+    def article_key(news_item):
+        """Stable hash of the normalized article"""
+        parts = [
+            normalize_text(news_item.title),
+            normalize_text(news_item.description),
+            news_item.source.lower()
+        ]
+        return hashlib.sha256('\x1f'.join(parts).encode('utf-8')).hexdigest()[:32]
+
+    def get(self, article_key, style=None):
+        """Return a cached tweet for the article (any style when style is None)"""
+        now = time.time()
+        with self._lock:
+            candidates = [key for key in self.entries if key[0] == article_key and (style is None or key[1] == style)]
+            for key in reversed(candidates):
+                entry = self.entries[key]
+                if now - entry['created_at'] > self.ttl:
+                    del self.entries[key]
+                    continue
+                self.entries.move_to_end(key)
+                self.stats['hits'] += 1
+                self.stats['latency_saved'] += entry.get('latency', 0.0)
+                return entry['text']
+            self.stats['misses'] += 1
+            return None
+
+    def contains(self, article_key):
+        """Whether an unexpired tweet is cached for the article, without counting a lookup"""
+        now = time.time()
+        with self._lock:
+            return any(key[0] == article_key and now - entry['created_at'] <= self.ttl
+                       for key, entry in self.entries.items())
+
+    def put(self, article_key, style, text, latency=0.0):
+        """Cache a tweet that passed validation"""
+        self.put_many([(article_key, style, text, latency)])
+
+    def put_many(self, tweets):
+        """Cache several validated (article key, style, text, latency) tweets with one save"""
+        with self._lock:
+            for article_key, style, text, latency in tweets:
+                key = (article_key, style)
+                self.entries[key] = {'text': text, 'created_at': time.time(), 'latency': latency}
+                self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+        self.save()
+
+    def discard(self, article_key):
+        """Forget every cached tweet for an article"""
+        with self._lock:
+            for key in [key for key in self.entries if key[0] == article_key]:
+                del self.entries[key]
+        self.save()
+
+    def get_stats(self):
+        """Hit rate and LLM latency saved"""
+        with self._lock:
+            lookups = self.stats['hits'] + self.stats['misses']
+            return {
+                'entries': len(self.entries),
+                'hits': self.stats['hits'],
+                'misses': self.stats['misses'],
+                'hit_rate': self.stats['hits'] / lookups if lookups else 0.0,
+                'latency_saved_seconds': round(self.stats['latency_saved'], 3)
+            }
+
+    def load(self):
+        """Load unexpired tweets from disk"""
+        if not self.path or not os.path.exists(self.path):
+            return False
+        try:
+            with open(self.path, 'r') as f:
+                rows = json.load(f)
+            now = time.time()
+            with self._lock:
+                for row in rows:
+                    if now - row['created_at'] <= self.ttl:
+                        self.entries[(row['article'], row['style'])] = {
+                            'text': row['text'],
+                            'created_at': row['created_at'],
+                            'latency': row.get('latency', 0.0)
+                        }
+            self.logger.info(f"📂 Loaded {len(self.entries)} cached tweets")
+            return True
+        except Exception as e:
+            self.logger.error(f"❌ Error loading tweet cache: {e}")
+            return False
+
+    def save(self):
+        """Atomically persist the cache to disk"""
+        if not self.path:
+            return False
+        try:
+            with self._lock:
+                rows = [
+                    {'article': article, 'style': style, **entry}
+                    for (article, style), entry in self.entries.items()
+                ]
+                os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+                tmp_path = self.path + '.tmp'
+                with open(tmp_path, 'w') as f:
+                    json.dump(rows, f)
+                os.replace(tmp_path, self.path)
+            return True
+        except Exception as e:
+            self.logger.error(f"❌ Error saving tweet cache: {e}")
+            return False
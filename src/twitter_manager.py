@@ -1,52 +1,240 @@
-import tweepy
 import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from requests.adapters import HTTPAdapter
+from .deadline import Deadline
+from .metrics import track_call
+from .startup_profile import startup_profile
+from .token_bucket import TokenBucket
 from config import (
     TWITTER_API_KEY, TWITTER_API_SECRET,
-    TWITTER_ACCESS_TOKEN, TWITTER_ACCESS_SECRET
+    TWITTER_ACCESS_TOKEN, TWITTER_ACCESS_SECRET, TWITTER_ACCOUNTS,
+    TWITTER_POST_LIMIT, TWITTER_POST_WINDOW, TWITTER_MAX_FAILURES, TWITTER_FAILURE_COOLDOWN,
+    TWITTER_REQUEST_TIMEOUT, CYCLE_MIN_STEP
 )
 
+class TimeoutHTTPAdapter(HTTPAdapter):
+    """Adapter that applies a default timeout, since tweepy sends requests without one"""
+
+    def __init__(self, timeout=TWITTER_REQUEST_TIMEOUT, **kwargs):
+        super().__init__(**kwargs)
+        self.default_timeout = timeout
+        self._local = threading.local()
+
+    @contextmanager
+    def timeout_for(self, seconds):
+        """Use a tighter timeout for requests sent from this thread inside the block"""
+        previous = getattr(self._local, 'timeout', None)
+        self._local.timeout = seconds
+        try:
+            yield
+        finally:
+            self._local.timeout = previous
+
+    def send(self, request, **kwargs):
+        if kwargs.get('timeout') is None:
+            kwargs['timeout'] = getattr(self._local, 'timeout', None) or self.default_timeout
+        return super().send(request, **kwargs)
+
+@contextmanager
+def _no_timeout():
+    yield
+
+class TwitterAccount:
+    """One posting account: its client, its own rate-limit bucket and failure state"""
+
+    def __init__(self, name, client, post_limit=TWITTER_POST_LIMIT, post_window=TWITTER_POST_WINDOW):
+        self.name = name
+        self.client = client
+        # Real tweepy clients get a timeout on their session; stand-ins without one are left alone
+        self.adapter = None
+        session = getattr(client, 'session', None)
+        if session is not None and hasattr(session, 'mount'):
+            self.adapter = TimeoutHTTPAdapter()
+            session.mount('https://', self.adapter)
+        self.bucket = TokenBucket(post_limit, post_window)
+        self.consecutive_failures = 0
+        self.benched_until = 0.0
+        self.stats = {'posted': 0, 'failed': 0, 'rate_limited': 0, 'skipped': 0}
+
+    def timeout_for(self, seconds):
+        """Bound this account's API calls in the current thread"""
+        if self.adapter is None:
+            return _no_timeout()
+        return self.adapter.timeout_for(seconds)
+
+    def is_benched(self):
+        return time.monotonic() < self.benched_until
+
+    def record_success(self):
+        self.consecutive_failures = 0
+        self.stats['posted'] += 1
+
+    def record_failure(self):
+        """Count an error; returns True when the account just got benched"""
+        self.stats['failed'] += 1
+        self.consecutive_failures += 1
+        if self.consecutive_failures >= TWITTER_MAX_FAILURES:
+            self.consecutive_failures = 0
+            self.benched_until = time.monotonic() + TWITTER_FAILURE_COOLDOWN
+            return True
+        return False
+
+    def get_stats(self):
+        return {
+            **self.stats,
+            'benched_for': round(max(0.0, self.benched_until - time.monotonic()), 1),
+            'bucket': self.bucket.get_stats()
+        }
+
 class TwitterManager:
-    def __init__(self):
+    def __init__(self, client=None, accounts=None, post_limit=TWITTER_POST_LIMIT, post_window=TWITTER_POST_WINDOW):
         self.logger = logging.getLogger(__name__)
-        self.client = self.setup_twitter()
+        if client is not None:
+            accounts = {'primary': client}
+        elif accounts is None:
+            accounts = self.setup_twitter()
+
+        self.accounts = {
+            name: TwitterAccount(name, account_client, post_limit, post_window)
+            for name, account_client in accounts.items()
+        }
+        # One worker per account so a slow account never queues behind another
+        self.executor = ThreadPoolExecutor(
+            max_workers=len(self.accounts), thread_name_prefix='twitter-post'
+        ) if len(self.accounts) > 1 else None
+
+    @property
+    def client(self):
+        """Client of the first configured account"""
+        return next(iter(self.accounts.values())).client
 
     def setup_twitter(self):
-        """Setup Twitter API client"""
+        """Setup a Twitter API client for every configured account"""
         try:
-            client = tweepy.Client(
-                consumer_key=TWITTER_API_KEY,
-                consumer_secret=TWITTER_API_SECRET,
-                access_token=TWITTER_ACCESS_TOKEN,
-                access_token_secret=TWITTER_ACCESS_SECRET
-            )
-            self.logger.info("✅ Twitter API configured successfully")
-            return client
+            # Imported here so the SDK's import cost is paid on first use, not at app startup
+            with startup_profile.measure('twitter', 'import'):
+                import tweepy
+            credentials = {}
+            if TWITTER_API_KEY or not TWITTER_ACCOUNTS:
+                credentials['primary'] = {
+                    'api_key': TWITTER_API_KEY,
+                    'api_secret': TWITTER_API_SECRET,
+                    'access_token': TWITTER_ACCESS_TOKEN,
+                    'access_secret': TWITTER_ACCESS_SECRET
+                }
+            for index, account in enumerate(TWITTER_ACCOUNTS):
+                credentials[account.get('name') or f'account{index + 1}'] = account
+
+            clients = {
+                name: tweepy.Client(
+                    consumer_key=creds.get('api_key'),
+                    consumer_secret=creds.get('api_secret'),
+                    access_token=creds.get('access_token'),
+                    access_token_secret=creds.get('access_secret')
+                )
+                for name, creds in credentials.items()
+            }
+            self.logger.info(f"✅ Twitter API configured successfully ({len(clients)} accounts)")
+            return clients
         except Exception as e:
             self.logger.error(f"❌ Twitter setup failed: {e}")
             raise
 
     def post_tweet(self, content):
-        """Post tweet to Twitter"""
+        """Post tweet to every account; True if at least one account posted it"""
+        results = self.post_to_accounts(content)
+        return any(result['ok'] for result in results.values())
+
+    def post_to_accounts(self, content, budget=None):
+        """Post concurrently, one text for all accounts or a dict of per-account variants"""
+        budget = budget or Deadline.unbounded()
+        if isinstance(content, dict):
+            targets = [(self.accounts[name], text) for name, text in content.items() if name in self.accounts]
+        else:
+            targets = [(account, content) for account in self.accounts.values()]
+
+        if self.executor is None or len(targets) == 1:
+            return {account.name: self._post_from_account(account, text, budget) for account, text in targets}
+
+        futures = {account.name: self.executor.submit(self._post_from_account, account, text, budget)
+                   for account, text in targets}
+        # No timeout here: an abandoned create_tweet may still land, and retrying it would post twice.
+        # The session's HTTP timeouts are what bound each call.
+        return {name: future.result() for name, future in futures.items()}
+
+    def _post_from_account(self, account, content, budget):
+        """Post from one account; errors stay with that account"""
+        import tweepy
+        if account.is_benched():
+            account.stats['skipped'] += 1
+            return {'ok': False, 'error': 'benched after repeated failures',
+                    'retry_after': account.benched_until - time.monotonic(), 'retryable': True}
+        if not account.bucket.try_acquire():
+            account.stats['rate_limited'] += 1
+            self.logger.warning(f"⏳ {account.name} is out of posting budget, skipping")
+            return {'ok': False, 'error': 'rate limited', 'retry_after': account.bucket.wait_time(), 'retryable': True}
+
         try:
-            response = self.client.create_tweet(text=content)
+            timeout = budget.timeout(TWITTER_REQUEST_TIMEOUT, floor=CYCLE_MIN_STEP)
+            with track_call('twitter', 'create_tweet') as call, account.timeout_for(timeout):
+                response = account.client.create_tweet(text=content)
+                call.payload_bytes = len(content.encode('utf-8'))
             tweet_id = response.data['id']
-            self.logger.info(f"✅ Tweet posted successfully: {tweet_id}")
-            return True
+            account.record_success()
+            self.logger.info(f"✅ Tweet posted successfully from {account.name}: {tweet_id}")
+            return {'ok': True, 'tweet_id': tweet_id, 'retry_after': None, 'retryable': False}
+        except tweepy.TooManyRequests as e:
+            # The server's window is authoritative: hold this account's bucket until it resets
+            wait = self.rate_limit_reset_in(e)
+            account.bucket.block_for(wait)
+            account.stats['rate_limited'] += 1
+            self.logger.warning(f"⏳ {account.name} hit the Twitter rate limit, pausing {wait:.0f}s")
+            return {'ok': False, 'error': 'rate limited', 'retry_after': wait, 'retryable': True}
+        except (tweepy.BadRequest, tweepy.Forbidden) as e:
+            # Rejected content (duplicate, too long, policy): posting it again won't help
+            self.logger.error(f"❌ Twitter rejected the tweet on {account.name}: {e}")
+            return {'ok': False, 'error': str(e), 'retry_after': None, 'retryable': False}
         except tweepy.TweepyException as e:
-            self.logger.error(f"❌ Twitter API error: {e}")
-            return False
+            self.logger.error(f"❌ Twitter API error on {account.name}: {e}")
+            error = str(e)
         except Exception as e:
-            self.logger.error(f"❌ Error posting tweet: {e}")
-            return False
+            self.logger.error(f"❌ Error posting tweet from {account.name}: {e}")
+            error = str(e)
+
+        if account.record_failure():
+            self.logger.warning(f"🚫 {account.name} benched for {TWITTER_FAILURE_COOLDOWN}s after repeated failures")
+        return {'ok': False, 'error': error, 'retry_after': None, 'retryable': True}
+
+    @staticmethod
+    def rate_limit_reset_in(error):
+        """Seconds until the rate limit in a 429 response resets"""
+        try:
+            reset_at = int(error.response.headers.get('x-rate-limit-reset'))
+            return max(1.0, reset_at - time.time())
+        except (AttributeError, TypeError, ValueError):
+            return float(TWITTER_POST_WINDOW)
 
     def verify_credentials(self):
-        """Verify Twitter credentials"""
+        """Verify Twitter credentials for every account"""
+        if self.executor is None:
+            return all(self._verify_account(account) for account in self.accounts.values())
+        return all(self.executor.map(self._verify_account, self.accounts.values()))
+
+    def _verify_account(self, account):
         try:
-            user = self.client.get_me()
+            with track_call('twitter', 'get_me'):
+                user = account.client.get_me()
             if user.data:
-                self.logger.info("✅ Twitter credentials verified")
+                self.logger.info(f"✅ Twitter credentials verified for {account.name}")
                 return True
             return False
         except Exception as e:
-            self.logger.error(f"❌ Twitter credentials verification failed: {e}")
+            self.logger.error(f"❌ Twitter credentials verification failed for {account.name}: {e}")
             return False
+
+    def get_stats(self):
+        """Per-account posting counters and remaining budget"""
+        return {name: account.get_stats() for name, account in self.accounts.items()}
@@ -0,0 +1,7 @@
+import os
+import sys
+import tempfile
+
+# Keep local state (caches, outbox, journal) out of the working tree; set before config is imported
+os.environ.setdefault('BOT_DATA_DIR', tempfile.mkdtemp(prefix='botdata-'))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
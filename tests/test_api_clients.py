@@ -0,0 +1,33 @@
+import random
+import time
+
+import pytest
+
+from benchmarks.fakes import FakeNewsServer, FaultProfile
+from src.api_clients import APIClient
+
+@pytest.fixture
+def client():
+    server = FakeNewsServer(FaultProfile(rng=random.Random(0)), feed_size=5).start()
+    api_client = APIClient()
+    for source, config in api_client.api_configs.items():
+        config['url'] = f'{server.base_url}/{source}'
+    yield api_client
+    server.stop()
+
+def test_hedged_stale_hit_still_refreshes(client):
+    source = 'coingecko'
+    assert client.get_hedged_news(sources=[source])
+    # Age the entry past its TTL but within the stale grace window
+    client.feed_cache.entries[source]['fetched_at'] -= client.feed_cache.ttl + 1
+
+    assert client.get_hedged_news(sources=[source])
+    for _ in range(50):
+        if not client.feed_cache.refreshing:
+            break
+        time.sleep(0.05)
+
+    stats = client.feed_cache.get_stats()
+    assert stats['stale_hits'] == 1
+    assert stats['refresh_errors'] == 0
+    assert time.monotonic() - client.feed_cache.entries[source]['fetched_at'] < client.feed_cache.ttl
@@ -0,0 +1,108 @@
+import threading
+import time
+from types import SimpleNamespace
+
+import google.generativeai as genai
+import pytest
+
+from src.content_generator import ContentGenerator
+from src.news_item import NewsItem
+
+TWEET = "BREAKING: Bitcoin ETF inflows hit a record this week. What is your take? #Crypto #Bitcoin"
+
+class RecordingModel:
+    """Accepts any call and keeps the keywords so they can be checked against the real SDK"""
+
+    def __init__(self, text=TWEET):
+        self.text = text
+        self.calls = []
+
+    def generate_content(self, prompt, **kwargs):
+        self.calls.append((prompt, kwargs))
+        return SimpleNamespace(text=self.text)
+
+def news(n=0):
+    return NewsItem(title=f'Bitcoin ETF inflows hit a record {n}',
+                    description='Spot bitcoin funds saw large inflows this week as institutions bought in.',
+                    url=f'https://news.example/{n}', source='coingecko')
+
+@pytest.fixture
+def generator():
+    model = RecordingModel()
+    gen = ContentGenerator(model=model)
+    gen.tweet_cache.path = None
+    gen.tweet_cache.entries.clear()
+    return gen, model
+
+def assert_sdk_accepts(calls):
+    real = genai.GenerativeModel('gemini-pro')
+    for prompt, kwargs in calls:
+        real._prepare_request(contents=prompt, **kwargs)
+
+@pytest.mark.parametrize('timeout', [None, 5])
+def test_variant_request_is_valid_for_sdk(generator, timeout):
+    gen, model = generator
+    variant = gen.generate_variant(news(), 'breaking_news', ['Crypto'], temperature=0.7, timeout=timeout)
+    assert variant is not None
+    assert_sdk_accepts(model.calls)
+
+@pytest.mark.parametrize('timeout', [None, 5])
+def test_batch_request_is_valid_for_sdk(generator, timeout):
+    gen, model = generator
+    model.text = f'[{{"id": 1, "tweet": "{TWEET}"}}]'
+    assert gen.generate_batch([news()], timeout=timeout)
+    assert_sdk_accepts(model.calls)
+
+def test_call_gemini_times_out(generator):
+    gen, model = generator
+    model.generate_content = lambda prompt, **kwargs: time.sleep(0.5)
+    with pytest.raises(TimeoutError):
+        gen.call_gemini('prompt', timeout=0.05)
+
+def test_batch_fills_ready_queue_and_posting_prunes_it(generator):
+    gen, model = generator
+    items = [news(n) for n in range(3)]
+    model.text = '[' + ', '.join(f'{{"id": {n}, "tweet": "{TWEET}"}}' for n in (1, 2, 3)) + ']'
+
+    assert gen.create_high_quality_tweet(items[0], upcoming=items[1:]) == TWEET
+    assert all(gen.tweet_cache.contains(gen.tweet_cache.article_key(item)) for item in items)
+
+    gen.forget_article(items[0])
+    assert not gen.tweet_cache.contains(gen.tweet_cache.article_key(items[0]))
+    assert gen.tweet_cache.contains(gen.tweet_cache.article_key(items[1]))
+
+@pytest.mark.parametrize('text, expected', [
+    ('[{"id": 1, "tweet": "a"}, {"id": 2, "tweet": "b"}]', {0: 'a', 1: 'b'}),
+    ('```json\n[{"id": "2", "tweet": " b "}]\n```', {1: 'b'}),
+    ('[{"id": 1, "tweet": "a"}, {"id": 1, "tweet": "again"}]', {0: 'a'}),
+    ('[{"id": 9, "tweet": "x"}, {"tweet": "y"}, {"id": 1, "tweet": 5}, "z"]', {}),
+    ('[{"id": 1, "tweet": "a"', {}),
+    ('no json here', {}),
+])
+def test_parse_batch_response(generator, text, expected):
+    gen, _ = generator
+    assert gen.parse_batch_response(text, 2) == expected
+
+def test_hung_calls_do_not_queue_prompts(generator):
+    gen, model = generator
+    release = threading.Event()
+    started = []
+
+    def hang(prompt, **kwargs):
+        started.append(prompt)
+        release.wait(5)
+        return SimpleNamespace(text=TWEET)
+    model.generate_content = hang
+
+    workers = gen.gemini_executor._max_workers
+    for n in range(workers):
+        with pytest.raises(TimeoutError):
+            gen.call_gemini(f'hung {n}', timeout=0.01)
+    # Every worker is stuck: the next prompt is refused rather than queued to run later
+    with pytest.raises(TimeoutError, match='still waiting'):
+        gen.call_gemini('queued', timeout=0.01)
+
+    release.set()
+    gen.gemini_executor.shutdown(wait=True)
+    assert 'queued' not in started
+    assert gen.gemini_slots.acquire(blocking=False)
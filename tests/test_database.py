@@ -0,0 +1,88 @@
+import random
+import time
+from datetime import datetime
+
+from benchmarks.fakes import FakeSupabaseClient, FaultProfile
+from src.database import DatabaseManager
+from src.news_item import NewsItem
+from src.sqlite_storage import SQLiteStorage
+from src.supabase_storage import SupabaseStorage
+
+def replica_with(titles, error_rate=0.0):
+    client = FakeSupabaseClient(FaultProfile(error_rate=error_rate, rng=random.Random(0)))
+    replica = SupabaseStorage(client)
+    for title in titles:
+        replica.insert_posts([{'title': title, 'url': None, 'content': 'tweet', 'source': 'coingecko',
+                               'posted_at': datetime.now().isoformat()}])
+    return client, replica
+
+def item(title):
+    return NewsItem(title=title, description='', url=None, source='coingecko')
+
+def test_backfill_copies_history_and_writes_marker(tmp_path):
+    _, replica = replica_with(['old story'])
+    db = DatabaseManager(storage=SQLiteStorage(str(tmp_path / 'bot.sqlite3')), replica=replica)
+    assert db.history_complete.wait(5)
+    assert db.storage.is_posted('old story')
+    assert (tmp_path / 'bot.sqlite3.backfilled').exists()
+
+    # A restart on the same disk trusts the local copy straight away
+    again = DatabaseManager(storage=SQLiteStorage(str(tmp_path / 'bot.sqlite3')), replica=replica)
+    assert again.history_complete.is_set()
+
+def test_incomplete_history_checks_replica_and_fails_closed(tmp_path):
+    client, replica = replica_with(['old story'])
+    client.profile.error_rate = 1.0  # replica down: the backfill keeps retrying
+    db = DatabaseManager(storage=SQLiteStorage(str(tmp_path / 'bot.sqlite3')), replica=replica)
+    assert not db.history_complete.is_set()
+    assert db.filter_unposted([item('old story'), item('new story')]) == []
+    assert db.is_news_posted('new story')
+
+    client.profile.error_rate = 0.0
+    assert [news.title for news in db.filter_unposted([item('old story'), item('new story')])] == ['new story']
+
+def test_stats_count_every_source_and_posts_made_during_resync(tmp_path):
+    _, replica = replica_with([])
+    replica.insert_posts([{'title': 'from a new feed', 'url': None, 'content': 'tweet',
+                           'source': 'newfeed', 'posted_at': datetime.now().isoformat()}])
+    db = DatabaseManager(storage=replica)
+
+    load = db._load_stats_counters
+    def load_while_posting():
+        counters = load()
+        # Lands after the snapshot was taken but before the counters are swapped in
+        db._record_post_in_stats('coingecko', datetime.now().isoformat())
+        return counters
+    db._load_stats_counters = load_while_posting
+
+    stats = db.get_bot_stats()
+    assert stats['total_posts'] == 2
+    assert sum(stats['source_stats'].values()) == 2
+    assert stats['last_24h_posts'] == 2
+
+def test_post_during_backfill_keeps_old_titles_posted(tmp_path):
+    _, replica = replica_with(['old story'])
+    rows_since = replica.rows_since
+    holder = {}
+
+    def rows_since_with_a_post(*args, **kwargs):
+        # A cycle posts while the backfill is still copying history
+        if not holder.get('posted'):
+            holder['posted'] = True
+            holder['db'].mark_news_as_posted('new story', 'https://news.example/new', 'tweet', 'coingecko')
+        return rows_since(*args, **kwargs)
+    replica.rows_since = rows_since_with_a_post
+
+    storage = SQLiteStorage(str(tmp_path / 'bot.sqlite3'))
+    db = holder['db'] = DatabaseManager.__new__(DatabaseManager)
+    db.__init__(storage=storage, replica=replica)
+    db.dedup_index.path = str(tmp_path / 'dedup_index.bin')
+    assert db.history_complete.wait(5)
+    for _ in range(100):
+        if db.dedup_index.ready:
+            break
+        time.sleep(0.05)
+
+    assert db.is_news_posted('old story')
+    assert db.is_news_posted('new story')
+    assert db.filter_unposted([item('old story'), item('fresh story')])[0].title == 'fresh story'
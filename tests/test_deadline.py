@@ -0,0 +1,24 @@
+import pytest
+
+from src.deadline import Deadline
+
+def test_timeout_is_capped_by_the_call_limit():
+    assert Deadline(60).timeout(15) == pytest.approx(15)
+
+def test_timeout_keeps_the_reserve_for_later_stages():
+    assert Deadline(30).timeout(15, reserve=20) == pytest.approx(10, abs=0.1)
+
+def test_floor_wins_over_the_reserve_but_not_the_time_left():
+    assert Deadline(30).timeout(15, reserve=29, floor=2) == pytest.approx(2)
+    assert Deadline(1).timeout(15, reserve=5, floor=2) == pytest.approx(1, abs=0.1)
+
+def test_expired_deadline_gives_no_time():
+    budget = Deadline(0)
+    assert budget.expired()
+    assert not budget.has(0.001)
+    assert budget.timeout(15, floor=2) == 0
+
+def test_unbounded_never_runs_short():
+    budget = Deadline.unbounded()
+    assert budget.has(10 ** 9)
+    assert budget.timeout(15, reserve=30) == 15
@@ -0,0 +1,29 @@
+from src.dedup_index import DedupIndex
+
+def test_posts_before_warming_do_not_move_the_saved_watermark(tmp_path):
+    path = str(tmp_path / 'dedup_index.bin')
+    index = DedupIndex(path=path)
+    index.add('new story', None, '2026-01-02T00:00:00')
+    assert not index.save()
+    assert index.watermark is None
+
+    index.warm('old story', None, '2026-01-01T00:00:00')
+    index.mark_ready()
+    assert index.might_contain('old story') and index.might_contain('new story')
+    assert index.watermark == '2026-01-02T00:00:00'
+    assert index.save()
+
+    reloaded = DedupIndex(path=path)
+    assert reloaded.load()
+    assert reloaded.might_contain('old story')
+
+def test_load_never_replaces_a_filled_index(tmp_path):
+    path = str(tmp_path / 'dedup_index.bin')
+    saved = DedupIndex(path=path)
+    saved.mark_ready()
+    saved.save()
+
+    index = DedupIndex(path=path)
+    index.warm('old story')
+    assert not index.load()
+    assert index.might_contain('old story')
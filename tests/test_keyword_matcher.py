@@ -0,0 +1,37 @@
+import pytest
+
+from src.keyword_matcher import KeywordMatcher
+
+@pytest.mark.parametrize('text, expected', [
+    ('New Bitcoin ETF approved', {'bitcoin', 'bitcoin etf', 'etf'}),
+    ('Bitcoin ETFs see inflows', {'bitcoin', 'bitcoin etf', 'etf'}),
+    ('Bitcoin rallies', {'bitcoin'}),
+    ('Bitcoins everywhere', {'bitcoin'}),
+    ('Bitcoiner meetup', set()),
+    ('ETFtastic', set()),
+    ('', set()),
+])
+def test_find_all_reports_nested_keywords(text, expected):
+    assert KeywordMatcher(['bitcoin', 'bitcoin etf', 'etf']).find_all(text) == expected
+
+def test_shorter_keyword_must_end_on_a_word_boundary():
+    matcher = KeywordMatcher(['sec', 'security token'])
+    assert matcher.find_all('A security token offering') == {'security token'}
+    assert matcher.find_all('The SEC security token rules') == {'sec', 'security token'}
+
+def test_overlapping_keywords_at_different_words():
+    matcher = KeywordMatcher(['defi', 'defi protocol', 'protocol upgrade'])
+    assert matcher.find_all('DeFi protocol upgrade ships') == {'defi', 'defi protocol', 'protocol upgrade'}
+
+def test_keywords_are_normalized():
+    matcher = KeywordMatcher([' Ethereum ', '', None, 'NFT'])
+    assert matcher.keywords == {'ethereum', 'nft'}
+    assert matcher.find_all('ethereum NFTs') == {'ethereum', 'nft'}
+
+def test_regex_metacharacters_are_literal():
+    matcher = KeywordMatcher(['s&p 500', 'c.e.o'])
+    assert matcher.find_all('S&P 500 and the c.e.o') == {'s&p 500', 'c.e.o'}
+    assert matcher.find_all('cxexo') == set()
+
+def test_empty_matcher():
+    assert KeywordMatcher([]).find_all('bitcoin') == set()
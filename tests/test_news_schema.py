@@ -0,0 +1,70 @@
+import json
+
+import pytest
+
+from src.news_schema import NewsExtractor
+
+SCHEMA = {
+    'articles_path': ('data', 'news'),
+    'fields': {'title': 'title', 'description': 'description', 'url': 'url'},
+    'limit': 2
+}
+
+def article(n, **extra):
+    return {'title': f'Story {n}', 'description': f'About story {n}', 'url': f'https://news.example/{n}', **extra}
+
+def titles(items):
+    return [item.title for item in items]
+
+def accept_all(article):
+    return True
+
+@pytest.fixture
+def extractor():
+    return NewsExtractor('coingecko', SCHEMA)
+
+def test_skips_sibling_keys_before_the_path(extractor):
+    body = json.dumps({
+        'meta': {'news': ['not these'], 'count': [1, {'x': '}'}]},
+        'status': 'ok',
+        'data': {'total': 3, 'news': [article(1), article(2)]}
+    })
+    assert titles(extractor.extract_from_text(body, accept_all)) == ['Story 1', 'Story 2']
+
+def test_braces_and_brackets_inside_strings(extractor):
+    tricky = article(1, title='Ends with ] and } and "quotes" {[')
+    body = json.dumps({'data': {'note': '], }{ [', 'news': [tricky, article(2)]}})
+    assert titles(extractor.extract_from_text(body, accept_all)) == ['Ends with ] and } and "quotes" {[', 'Story 2']
+
+def test_stops_decoding_at_the_limit(extractor):
+    # Anything after the limit is never decoded, so a broken tail doesn't matter
+    body = json.dumps({'data': {'news': [article(1), article(2)]}})[:-3] + ', {broken'
+    assert titles(extractor.extract_from_text(body, accept_all)) == ['Story 1', 'Story 2']
+
+def test_limit_counts_only_valid_articles(extractor):
+    body = json.dumps({'data': {'news': [article(1), 'not an article', article(2), article(3)]}})
+    is_valid = lambda a: a['title'] != 'Story 2'
+    assert titles(extractor.extract_from_text(body, is_valid)) == ['Story 1', 'Story 3']
+
+def test_truncated_body_before_the_limit_fails(extractor):
+    body = json.dumps({'data': {'news': [article(1), article(2)]}})[:40]
+    with pytest.raises(ValueError):
+        extractor.extract_from_text(body, accept_all)
+
+def test_unexpected_layout_falls_back_to_a_full_decode(extractor):
+    # A path key that isn't a string key at all trips the streaming walk, not json
+    body = json.dumps([{'data': 1}])
+    assert extractor.extract_from_text(body, accept_all) == []
+
+def test_invalid_json_raises(extractor):
+    with pytest.raises(ValueError):
+        extractor.extract_from_text('<html>rate limited</html>', accept_all)
+
+def test_missing_path_gives_no_items(extractor):
+    assert extractor.extract_from_text(json.dumps({'data': {'items': [article(1)]}}), accept_all) == []
+    assert extractor.extract_from_text(json.dumps({'error': 'quota'}), accept_all) == []
+
+def test_top_level_list():
+    extractor = NewsExtractor('coinpaprika', dict(SCHEMA, articles_path=()))
+    assert titles(extractor.extract_from_text(json.dumps([article(1)]), accept_all)) == ['Story 1']
+    assert extractor.extract_from_text('  [ ]  ', accept_all) == []
@@ -0,0 +1,80 @@
+import time
+
+import pytest
+
+from src.news_item import NewsItem
+from src.post_outbox import PostOutbox
+
+TWEET = "BREAKING: Bitcoin ETF inflows hit a record this week. What is your take? #Crypto #Bitcoin"
+
+@pytest.fixture
+def outbox(tmp_path):
+    return PostOutbox(path=str(tmp_path / 'outbox.sqlite3'), max_attempts=2)
+
+def news(title='Bitcoin ETF inflows hit a record'):
+    return NewsItem(title=title, description='Spot bitcoin funds saw large inflows.',
+                    url='https://news.example/1', source='coingecko')
+
+def failing(error, retryable=True, retry_after=None):
+    def post(contents):
+        return {name: {'ok': False, 'error': error, 'retryable': retryable, 'retry_after': retry_after}
+                for name in contents}
+    return post
+
+def test_purge_failed_removes_only_old_given_up_entries(outbox):
+    old = outbox.enqueue(news('old'), TWEET, ['main'])
+    recent = outbox.enqueue(news('recent'), TWEET, ['main'])
+    outbox.enqueue(news('waiting'), TWEET, ['main'])
+    for entry_id in (old, recent):
+        assert outbox.deliver_now(entry_id, failing('forbidden', retryable=False), lambda *_: True) == 'failed'
+    with outbox.conn:
+        outbox.conn.execute("UPDATE outbox SET created_at = ? WHERE id = ?", (time.time() - 3600, old))
+
+    assert outbox.purge_failed(retention=60) == 1
+    assert outbox.get_stats()['failed'] == 1
+    assert outbox.get_stats()['pending'] == 1
+
+def succeeding(contents):
+    return {name: {'ok': True, 'tweet_id': '1', 'retry_after': None, 'retryable': False} for name in contents}
+
+def test_claimed_entry_is_not_handed_out_twice(outbox):
+    entry_id = outbox.enqueue(news(), TWEET, ['main'])
+    assert [entry['id'] for entry in outbox.claim()] == [entry_id]
+    assert outbox.claim() == []
+    assert outbox.claim(entry_id=entry_id) == []
+
+def test_posted_entry_is_confirmed_once_and_removed(outbox):
+    confirmed = []
+    entry_id = outbox.enqueue(news(), TWEET, ['main'])
+    status = outbox.deliver_now(entry_id, succeeding, lambda item, content: confirmed.append(item.title) or True)
+    assert status == 'posted'
+    assert confirmed == ['Bitcoin ETF inflows hit a record']
+    assert outbox.get_stats()['pending'] == 0
+
+def test_partial_post_retries_only_the_failed_account(outbox):
+    def post(contents):
+        results = succeeding(contents)
+        if 'second' in contents:
+            results['second'] = {'ok': False, 'error': 'timeout', 'retryable': True, 'retry_after': None}
+        return results
+
+    entry_id = outbox.enqueue(news(), TWEET, ['first', 'second'])
+    assert outbox.deliver_now(entry_id, post, lambda *_: True) == 'posted'
+    row = outbox.conn.execute("SELECT accounts, status, attempts FROM outbox WHERE id = ?", (entry_id,)).fetchone()
+    assert (row['accounts'], row['status'], row['attempts']) == ('["second"]', 'pending', 1)
+    assert outbox.next_due_in() > 0
+
+def test_rate_limit_waits_without_using_an_attempt(outbox):
+    entry_id = outbox.enqueue(news(), TWEET, ['main'])
+    assert outbox.deliver_now(entry_id, failing('429', retry_after=120), lambda *_: True) == 'pending'
+    row = outbox.conn.execute("SELECT attempts FROM outbox WHERE id = ?", (entry_id,)).fetchone()
+    assert row['attempts'] == 0
+    assert outbox.next_due_in() == pytest.approx(120, abs=2)
+
+def test_gives_up_after_max_attempts(outbox):
+    entry_id = outbox.enqueue(news(), TWEET, ['main'])
+    assert outbox.deliver_now(entry_id, failing('timeout'), lambda *_: True) == 'pending'
+    with outbox.conn:
+        outbox.conn.execute("UPDATE outbox SET next_attempt_at = 0")
+    assert outbox.drain(failing('timeout'), lambda *_: True) == 0
+    assert outbox.get_stats()['failed'] == 1
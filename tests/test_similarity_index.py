@@ -0,0 +1,60 @@
+import time
+from datetime import datetime, timedelta
+from src.news_item import NewsItem
+from src.news_manager import NewsManager
+from src.similarity_index import SimilarityIndex
+
+STORY = 'Bitcoin climbs above $70,000 as spot ETF inflows hit a record high this week'
+REWORDED = 'Bitcoin climbs above $70,000 as ETF inflows hit a record high'
+UNRELATED = 'Ethereum developers schedule the next network upgrade for testnet rollout'
+
+def test_signature_is_stable_across_instances(tmp_path):
+    first = SimilarityIndex(path=str(tmp_path / 'a.jsonl'))
+    second = SimilarityIndex(path=str(tmp_path / 'b.jsonl'))
+    assert first.signature(STORY) == second.signature(STORY)
+    assert len(first.signature(STORY)) == first.num_perm
+    assert first.signature('the of and') is None
+
+def test_reworded_story_matches_and_survives_a_reload(tmp_path):
+    path = str(tmp_path / 'similarity.jsonl')
+    index = SimilarityIndex(path=path)
+    index.add(STORY)
+    assert index.is_similar(REWORDED)
+    assert not index.is_similar(UNRELATED)
+
+    reloaded = SimilarityIndex(path=path)
+    assert reloaded.load()
+    assert reloaded.is_similar(REWORDED)
+
+def test_old_entries_fall_outside_the_window(tmp_path):
+    index = SimilarityIndex(path=str(tmp_path / 'similarity.jsonl'))
+    index.add(STORY, timestamp=time.time() - 10 * 86400)
+    assert index.best_match(STORY, window_days=3) == 0.0
+
+def test_signature_is_cached_on_the_item(tmp_path):
+    manager = NewsManager()
+    manager.similarity_index = SimilarityIndex(path=str(tmp_path / 'similarity.jsonl'))
+    item = NewsItem(STORY, '')
+    assert not manager.is_near_duplicate(item)
+    signature = item.similarity_signature
+    assert signature is not None
+
+    manager.remember_posted(item)
+    assert item.similarity_signature is signature
+    assert manager.is_near_duplicate(NewsItem(REWORDED, ''))
+
+def test_seeding_indexes_past_posts_and_persists_them(tmp_path):
+    path = str(tmp_path / 'similarity.jsonl')
+    manager = NewsManager()
+    manager.similarity_index = SimilarityIndex(path=path)
+    posted_at = (datetime.now() - timedelta(hours=5)).isoformat()
+    rows = [
+        {'title': STORY, 'content': '🚀 Big day for $BTC #Bitcoin', 'posted_at': posted_at},
+        {'title': 'Row without a timestamp', 'content': '', 'posted_at': None}
+    ]
+    assert manager.seed_similarity_index(rows) == 1
+    assert not manager.needs_similarity_seed
+    assert manager.is_near_duplicate(NewsItem(REWORDED, ''))
+
+    reloaded = SimilarityIndex(path=path)
+    assert reloaded.load() and len(reloaded) == 1
@@ -0,0 +1,56 @@
+import pytest
+
+from src.source_health import CLOSED, HALF_OPEN, OPEN, SourceHealth
+
+@pytest.fixture
+def health():
+    return SourceHealth(['a', 'b'], failure_threshold=2, cooldown=10, max_cooldown=40)
+
+def trip(health, source='a'):
+    for _ in range(health.failure_threshold):
+        assert health.allow(source)
+        health.record(source, ok=False, latency=0.1)
+
+def expire_cooldown(health, source='a'):
+    health.sources[source]['opened_at'] -= health.sources[source]['cooldown'] + 1
+
+def test_consecutive_failures_open_the_circuit(health):
+    trip(health)
+    assert health.sources['a']['state'] == OPEN
+    assert not health.allow('a')
+    assert health.available(['a', 'b']) == ['b']
+
+def test_one_probe_after_cooldown_and_success_closes(health):
+    trip(health)
+    expire_cooldown(health)
+    assert health.can_attempt('a')
+    assert health.allow('a')
+    assert health.sources['a']['state'] == HALF_OPEN
+    assert not health.allow('a')  # only one probe at a time
+
+    health.record('a', ok=True, latency=0.1, items=5)
+    assert health.sources['a']['state'] == CLOSED
+    assert health.sources['a']['cooldown'] == 10
+
+def test_failed_probe_reopens_with_longer_cooldown(health):
+    trip(health)
+    for expected in (20, 40, 40):
+        expire_cooldown(health)
+        assert health.allow('a')
+        health.record('a', ok=False, latency=0.1)
+        assert health.sources['a']['state'] == OPEN
+        assert health.sources['a']['cooldown'] == expected
+
+def test_released_probe_can_be_retried(health):
+    trip(health)
+    expire_cooldown(health)
+    assert health.allow('a')
+    health.release('a')
+    assert health.allow('a')
+
+def test_latency_percentile_needs_enough_samples(health):
+    for latency in range(1, 10):
+        health.record('a', ok=True, latency=latency / 10, items=1)
+    assert health.latency_percentile('a', 95, min_samples=10) is None
+    health.record('a', ok=True, latency=1.0, items=1)
+    assert health.latency_percentile('a', 50, min_samples=10) == pytest.approx(0.6)